@@ -1,9 +1,8 @@
-import networkx as nx
 import numpy as np
 import matplotlib.pyplot as plt
 import scipy.sparse
-import networkx as nx
-from matplotlib.animation import FuncAnimation
+
+from epidemic import Contact, GraphRenderer, Model, Spontaneous, export_animation, generate_graph, graph_layout, simulate
 
 # According to some studies, the basic reproduction number (R0) for smallpox is estimated to be around 5-7,
 # meaning that each infected person will on average infect 5-7 others. This translates to a high transmission rate, which can result in rapid spread of the disease.
@@ -28,95 +27,44 @@ delta = 0.02 # infection rate
 gamma = 0.083 # recovery rate
 
 t_max = 100 # number of time steps
+frame_stride = 1 # animate every step; raise it for quicker previews
+export_path = None # e.g. "outbreak.mp4", "outbreak.gif" or "frames/{:04d}.png" to save instead of showing
 
 
 
 # Define the strogatz graph
 n = 100 # number of nodes
 m = 5 # number of edges
-G = nx.barabasi_albert_graph(n,m)
-
-# Initialize state arrays
-S = np.ones(n)
-E = np.zeros(n)
-I = np.zeros(n)
-R = np.zeros(n)
-I[0] = 1 # initial infected node
-
-
-# Initialize history arrays
-S_history = np.zeros((n, t_max))
-I_history = np.zeros((n, t_max))
-R_history = np.zeros((n, t_max))
-E_history = np.zeros((n, t_max))
-
-# Store initial states
-S_history[:, 0] = S
-E_history[:, 0] = E
-I_history[:, 0] = I
-R_history[:, 0] = R
-
-pos = nx.random_layout(G)
-# Define plot function
-def plot_infection(t):
-    plt.clf()
-    plt.title('Epidemic Spread on Barabasi Albert Graph')    
-    node_colors = np.where(R == 1, 'green', np.where(I == 1, 'red', np.where(E == 1, 'orange','blue')))
-    nx.draw(G, pos, node_color=node_colors)
-    plt.text(-1.3, -1.3, f'Time Step: {t}/{t_max}')
-    plt.text(-1.3, -1.2, f'Infected Nodes: {int(np.sum(I))}')
-    plt.text(-1.3, -1.1, f'Susceptible Nodes: {int(np.sum(S))}')
-    plt.text(-1.3, -1.1, f'Exposed Nodes: {int(np.sum(E))}')
-    plt.text(-1.3, -1.0, f'Recovered Nodes: {int(np.sum(R))}')
-    
-
-# Define animation function
-def update(t):
-    global S, I, R, E
-    # Susceptible to exposed
-    for i in range(n):
-        if I[i] == 1:
-            neighbors = list(G.neighbors(i))
-            lamda = sum(I)*beta/n #expose probabilty
-            for j in neighbors:
-                if S[j] == 1:
-                    if np.random.rand() < lamda:
-                        S[j] = 0
-                        E[j] = 1
-
-    # Exposed to infected 
-    for i in range(n):
-        if E[i] == 1:
-            if np.random.rand() < delta:
-                E[i] = 0
-                I[i] = 1
-
-    # infected to recovered
-    for i in range(n):
-        if I[i] == 1:
-            if np.random.rand() < gamma:
-                I[i] = 0
-                R[i] = 1
-
-    # Store current states in history arrays
-    S_history[:, t] = S
-    I_history[:, t] = I
-    R_history[:, t] = R
-    E_history[:, t] = E
-
-    # Plot current state
-    plot_infection(t)
-
-# Create animation
-ani = FuncAnimation(plt.gcf(), update, frames=t_max, interval=50, repeat=False)
-
-# Show the animation
-plt.show()
+seed = None # set an int to reuse the same graph (and its layout) across runs
+graph = generate_graph("barabasi_albert", seed, n=n, m=m)
+
+# Define the SEIR variant of this script: exposure probability beta * I / n
+# per infected neighbor, and delta as the rate of exposed becoming infected
+SEIR = Model("SEIR", "SEIR", [
+    Contact("S", "E", "beta", mode="prevalence"),
+    Spontaneous("E", "I", "delta"),
+    Spontaneous("I", "R", "gamma"),
+])
+
+# Run the whole epidemic first, logging every state change
+rec = simulate(SEIR, graph, t_max, seeds=[0], record="events", beta=beta, delta=delta, gamma=gamma)
+
+# Replay the stored run, drawing the graph once and recoloring nodes per frame
+pos = graph_layout(graph, "random", seed=seed)
+if export_path:
+    # Write the frames to a file instead of opening a window
+    export_animation(rec, export_path, graph, pos, SEIR.compartments, stride=frame_stride, title='Epidemic Spread on Barabasi Albert Graph', t_max=t_max)
+else:
+    renderer = GraphRenderer(graph, pos, SEIR.compartments, title='Epidemic Spread on Barabasi Albert Graph', t_max=t_max)
+    ani = renderer.replay(rec, stride=frame_stride)
+
+    # Show the animation
+    plt.show()
 
 # Plot results
-plt.plot(np.sum(S_history, axis=0), label='Susceptible')
-plt.plot(np.sum(I_history, axis=0), label='Infected')
-plt.plot(np.sum(R_history, axis=0), label='Recovered')
+plt.plot(rec.count("S"), label='Susceptible')
+plt.plot(rec.count("I"), label='Infected')
+plt.plot(rec.count("R"), label='Recovered')
 plt.legend()
 plt.xlabel('Time')
 plt.ylabel('Number of Individuals')
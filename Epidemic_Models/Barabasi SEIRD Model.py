@@ -1,8 +1,8 @@
-import networkx as nx
 import numpy as np
 import matplotlib.pyplot as plt
 import scipy.sparse
-from matplotlib.animation import FuncAnimation
+
+from epidemic import SEIRD, GraphRenderer, export_animation, generate_graph, graph_layout, simulate
 
 
 # Define parameters
@@ -11,102 +11,36 @@ alpha = 0.2  # exposed to infected rate
 gamma = 0.1  # recovery rate
 mu = 0.01  # death rate
 t_max = 100  # number of time steps
+frame_stride = 1 # animate every step; raise it for quicker previews
+export_path = None # e.g. "outbreak.mp4", "outbreak.gif" or "frames/{:04d}.png" to save instead of showing
 
 
 # Define the Barabasi-Albert graph
 n = 100  # number of nodes
 m = 7  # number of edges
-G = nx.barabasi_albert_graph(n, m)
-
-# Initialize state arrays
-S = np.ones(n)
-E = np.zeros(n)
-I = np.zeros(n)
-R = np.zeros(n)
-D = np.zeros(n)
-I[0] = 1  # initial infected node
-
-# Initialize history arrays
-S_history = np.zeros((n, t_max))
-E_history = np.zeros((n, t_max))
-I_history = np.zeros((n, t_max))
-R_history = np.zeros((n, t_max))
-D_history = np.zeros((n, t_max))
-
-# Store initial states
-S_history[:, 0] = S
-E_history[:, 0] = E
-I_history[:, 0] = I
-R_history[:, 0] = R
-D_history[:, 0] = D
-
-pos = nx.spring_layout(G)
-# Define plot function
-def plot_infection(t):
-    plt.clf()
-    plt.title('SEIRD Epidemic Spread on Barabasi-Albert Graph')
-    node_colors = np.where(D == 1, 'black', np.where(R == 1, 'green', np.where(I == 1, 'red', np.where(E == 1, 'orange', 'blue'))))
-    nx.draw(G, pos, node_color=node_colors)
-    plt.text(-1.3, -0.5, f'Time Step: {t}/{t_max}')
-    plt.text(-1.3, -0.6, f'Infected Nodes: {int(np.sum(I))}')
-    plt.text(-1.3, -0.7, f'Susceptible Nodes: {int(np.sum(S))}')
-    plt.text(-1.3, -0.8, f'Exposed Nodes: {int(np.sum(E))}')
-    plt.text(-1.3, -0.9, f'Recovered Nodes: {int(np.sum(R))}')
-    plt.text(-1.3, -1.0, f'Dead Nodes: {int(np.sum(D))}')
+seed = None # set an int to reuse the same graph (and its layout) across runs
+graph = generate_graph("barabasi_albert", seed, n=n, m=m)
 
+# Run the whole epidemic first, logging every state change
+rec = simulate(SEIRD, graph, t_max, seeds=[0], record="events", beta=beta, alpha=alpha, gamma=gamma, mu=mu)
 
-# Define animation function
-def update(t):
-    global S, E, I, R, D
-    # Susceptible to exposed
-    for i in range(n):
-        if I[i] == 1:
-            neighbors = list(G.neighbors(i))
-            lambda_ = sum(I) * beta / n  # exposure probability
-            for j in neighbors:
-                if S[j] == 1:
-                    if np.random.rand() < lambda_:
-                        S[j] = 0
-                        E[j] = 1
+# Replay the stored run, drawing the graph once and recoloring nodes per frame
+pos = graph_layout(graph, "spring", seed=seed)
+if export_path:
+    # Write the frames to a file instead of opening a window
+    export_animation(rec, export_path, graph, pos, SEIRD.compartments, stride=frame_stride, title='SEIRD Epidemic Spread on Barabasi-Albert Graph', t_max=t_max)
+else:
+    renderer = GraphRenderer(graph, pos, SEIRD.compartments, title='SEIRD Epidemic Spread on Barabasi-Albert Graph', t_max=t_max)
+    ani = renderer.replay(rec, stride=frame_stride)
 
-    # Exposed to infected
-    for i in range(n):
-        if E[i] == 1:
-            if np.random.rand() < alpha:
-                E[i] = 0
-                I[i] = 1
-
-    # Infected to recovered or dead
-    for i in range(n):
-        if I[i] == 1:
-            if np.random.rand() < gamma:
-                if np.random.rand() < mu:
-                    I[i] = 0
-                    D[i] = 1
-                else:
-                    I[i] = 0
-                    R[i] = 1
-    
-
-    # Store current states in history arrays
-    S_history[:, t] = S
-    I_history[:, t] = I
-    R_history[:, t] = R
-    D_history[:, t] = D
-    # Plot current state
-    plot_infection(t)
-
-# Create animation
-ani = FuncAnimation(plt.gcf(), update, frames=t_max, interval=50, repeat=False)
-
-# Show the animation
-plt.show()
+    # Show the animation
+    plt.show()
 
 # Plot results
-plt.plot(np.sum(S_history, axis=0), label='Susceptible')
-plt.plot(np.sum(I_history, axis=0), label='Infected')
-plt.plot(np.sum(R_history, axis=0), label='Recovered')
-plt.plot(np.sum(D_history, axis=0), label='Deaseased')
+plt.plot(rec.count("S"), label='Susceptible')
+plt.plot(rec.count("I"), label='Infected')
+plt.plot(rec.count("R"), label='Recovered')
+plt.plot(rec.count("D"), label='Deaseased')
 plt.plot("SEIRD Model in Barabasi Graph")
 plt.legend()
 plt.xlabel('Time')
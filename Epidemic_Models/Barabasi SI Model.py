@@ -1,71 +1,38 @@
-import networkx as nx
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
+
+from epidemic import SI, GraphRenderer, export_animation, generate_graph, graph_layout, simulate
 
 # Define parameters
 beta = 0.02 # infection rate
 t_max = 100 # number of time steps
+frame_stride = 1 # animate every step; raise it for quicker previews
+export_path = None # e.g. "outbreak.mp4", "outbreak.gif" or "frames/{:04d}.png" to save instead of showing
 
 # Define the graph
 n = 100 # number of nodes
 m = 5 # number of edges
-G = nx.barabasi_albert_graph(n,m)
-
-
-# Initialize state arrays
-S = np.ones(n)
-I = np.zeros(n)
-I[0] = 1 # initial infected node
-
-# Initialize history arrays
-S_history = np.zeros((n, t_max))
-I_history = np.zeros((n, t_max))
-
-# Store initial states
-S_history[:, 0] = S
-I_history[:, 0] = I
+seed = None # set an int to reuse the same graph (and its layout) across runs
+graph = generate_graph("barabasi_albert", seed, n=n, m=m)
 
-# Define plot function
-def plot_infection(t):
-    plt.clf()
-    plt.title('Epidemic Spread on Barabasi Albert Graph')
-    pos = nx.spiral_layout(G)
-    nx.draw(G, pos, node_color=['red' if i == 1 else 'blue' for i in I])
-    plt.text(-1.3, 1.3, f'Time Step: {t}/{t_max}')
-    plt.text(-1.3, 1.2, f'Infected Nodes: {int(np.sum(I))}')
-    plt.text(-1.3, 1.1, f'Susceptible Nodes: {int(np.sum(S))}')
+# Run the whole epidemic first, logging every state change
+rec = simulate(SI, graph, t_max, seeds=[0], record="events", beta=beta)
 
-# Define animation function
-def update(t):
-    global I, S
+# Replay the stored run, drawing the graph once and recoloring nodes per frame
+pos = graph_layout(graph, "spiral", seed=seed)
+if export_path:
+    # Write the frames to a file instead of opening a window
+    export_animation(rec, export_path, graph, pos, SI.compartments, stride=frame_stride, title='Epidemic Spread on Barabasi Albert Graph', t_max=t_max)
+else:
+    renderer = GraphRenderer(graph, pos, SI.compartments, title='Epidemic Spread on Barabasi Albert Graph', t_max=t_max)
+    ani = renderer.replay(rec, stride=frame_stride)
 
-    # Infect susceptible neighbors
-    for i in range(n):
-        if I[i] == 1:
-            neighbors = list(G.neighbors(i))
-            for j in neighbors:
-                if S[j] == 1:
-                    if np.random.rand() < beta:
-                        S[j] = 0
-                        I[j] = 1
-
-    # Store current states in history arrays
-    I_history[:, t] = I
-    S_history[:, t] = S
-
-    # Plot current state
-    plot_infection(t)
-
-# Create animation
-ani = FuncAnimation(plt.gcf(), update, frames=t_max, interval=50, repeat=False)
-
-# Show the animation
-plt.show()
+    # Show the animation
+    plt.show()
 
 # Plot results
-plt.plot(np.sum(S_history, axis=0), label='Susceptible')
-plt.plot(np.sum(I_history, axis=0), label='Infected')
+plt.plot(rec.count("S"), label='Susceptible')
+plt.plot(rec.count("I"), label='Infected')
 plt.legend()
 plt.xlabel('Time')
 plt.ylabel('Number of Individuals')
@@ -1,7 +1,7 @@
-import networkx as nx
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
+
+from epidemic import SIRS_V, GraphRenderer, export_animation, generate_graph, graph_layout, simulate
 
 # Define parameters
 beta = 0.03  # infection rate
@@ -9,104 +9,37 @@ gamma = 0.02  # recovery rate
 mu = 0.005  # vaccination rate
 v = 0.005  # waning immunity rate
 t_max = 100  # number of time steps
+frame_stride = 1 # animate every step; raise it for quicker previews
+export_path = None # e.g. "outbreak.mp4", "outbreak.gif" or "frames/{:04d}.png" to save instead of showing
 
 # Define the graph
 n = 100  # number of nodes
 m = 5  # number of edges
-G = nx.barabasi_albert_graph(n, m)
-
-# Initialize state arrays
-S = np.ones(n)
-I = np.zeros(n)
-R = np.zeros(n)
-V = np.zeros(n)
-
-I[0] = 1  # initial infected node
-
-# Initialize history arrays
-S_history = np.zeros((n, t_max))
-I_history = np.zeros((n, t_max))
-R_history = np.zeros((n, t_max))
-V_history = np.zeros((n, t_max))
-
-# Store initial states
-S_history[:, 0] = S
-I_history[:, 0] = I
-R_history[:, 0] = R
-V_history[:, 0] = V
-
-# Define plot function
-def plot_infection(t):
-    plt.clf()
-    plt.title('Epidemic Spread on Barabasi Albert Graph')
-    pos = nx.spiral_layout(G)
-    node_colors = np.where(R == 1, 'green', np.where(I == 1, 'red', np.where(V == 1, 'pink','blue')))
-    nx.draw(G, pos, node_color=node_colors)
-    plt.text(-1.3, 1.3, f'Time Step: {t}/{t_max}')
-    plt.text(-1.3, 1.2, f'Infected Nodes: {int(np.sum(I))}')
-    plt.text(-1.3, 1.1, f'Susceptible Nodes: {int(np.sum(S))}')
-    plt.text(-1.3, 1.0, f'Recovered Nodes: {int(np.sum(R))}')
-    plt.text(-1.3, 0.9, f'Vaccinated Nodes: {int(np.sum(V))}')
-
-# Define animation function
-def update(t):
-    global S, I, R, V
-
-    # Infect susceptible neighbors
-    for i in range(n):
-        if I[i] == 1:
-            neighbors = list(G.neighbors(i))
-            for j in neighbors:
-                if S[j] == 1:
-                    if np.random.rand() < beta:
-                        S[j] = 0
-                        I[j] = 1
-
-    # Recover infected individuals
-    for i in range(n):
-        if I[i] == 1:
-            if np.random.rand() < gamma:
-                I[i] = 0
-                R[i] = 1
-
-    # Vaccinate susceptible individuals
-    for i in range(n):
-        if S[i] == 1:
-            if np.random.rand() < mu:
-                S[i] = 0
-                V[i] = 1
-
-    
-    # Waning immunity in recovered individuals
-    for i in range(n):
-        if R[i] == 1:
-            if np.random.rand() < v:
-                R[i] = 0
-                S[i] = 1
-
-    
-
-    # Store current states in history arrays
-    S_history[:, t] = S
-    I_history[:, t] = I
-    R_history[:, t] = R
-    V_history[:, t] = V
-
-    # Plot current state
-    plot_infection(t)
-
-
-# Create animation
-ani = FuncAnimation(plt.gcf(), update, frames=t_max, interval=50, repeat=False)
-
-# Show the animation
-plt.show()
+seed = None # set an int to reuse the same graph (and its layout) across runs
+graph = generate_graph("barabasi_albert", seed, n=n, m=m)
+
+# Run the whole epidemic first, logging every state change
+# Here mu is the vaccination rate and v the waning immunity rate, the other way
+# round from the SIRS-V model's parameters
+rec = simulate(SIRS_V, graph, t_max, seeds=[0], record="events", beta=beta, gamma=gamma, v=mu, mu=v)
+
+# Replay the stored run, drawing the graph once and recoloring nodes per frame
+pos = graph_layout(graph, "spiral", seed=seed)
+if export_path:
+    # Write the frames to a file instead of opening a window
+    export_animation(rec, export_path, graph, pos, SIRS_V.compartments, stride=frame_stride, title='Epidemic Spread on Barabasi Albert Graph', t_max=t_max)
+else:
+    renderer = GraphRenderer(graph, pos, SIRS_V.compartments, title='Epidemic Spread on Barabasi Albert Graph', t_max=t_max)
+    ani = renderer.replay(rec, stride=frame_stride)
+
+    # Show the animation
+    plt.show()
 
 # Plot results
-plt.plot(np.sum(S_history, axis=0), label='Susceptible')
-plt.plot(np.sum(I_history, axis=0), label='Infected')
-plt.plot(np.sum(R_history, axis=0), label='Recovered')
-plt.plot(np.sum(V_history, axis=0), label='Vaccinated')
+plt.plot(rec.count("S"), label='Susceptible')
+plt.plot(rec.count("I"), label='Infected')
+plt.plot(rec.count("R"), label='Recovered')
+plt.plot(rec.count("V"), label='Vaccinated')
 plt.legend()
 plt.xlabel('Time')
 plt.ylabel('Number of Individuals')
@@ -1,69 +1,36 @@
-import networkx as nx
 import numpy as np
 import matplotlib.pyplot as plt
 import scipy.sparse
-import networkx as nx
 from matplotlib.animation import FuncAnimation
 
+from epidemic import SIR, DensityRenderer, graph_layout, load_graph, simulate
+
 # Define parameters
 beta = 0.02 # infection rate
 gamma = 0.05 # recovery rate
 t_max = 100 # number of time steps
+animate = False # replay the run as a density map (logs every transition)
 
-# Read graph from edges file
-G = nx.read_edgelist("texas.mtx", nodetype=int, data=False)
-
-# Ensure that nodes are numbered starting from 1
-mapping = {node: node - 1 for node in G.nodes()}
-G = nx.relabel_nodes(G, mapping)
-n = G.number_of_nodes()
-
-# Initialize state arrays
-S = np.ones(n)
-I = np.zeros(n)
-R = np.zeros(n)
-I[0] = 1 # initial infected node
-
-# Initialize history arrays
-S_history = np.zeros((n, t_max))
-I_history = np.zeros((n, t_max))
-R_history = np.zeros((n, t_max))
-
-# Store initial states
-S_history[:, 0] = S
-I_history[:, 0] = I
-R_history[:, 0] = R
-
-
-for t in range(1,t_max):
-    print(t)
-    # Infect susceptible neighbors
-    for i in range(n):
-        if I[i] == 1:
-            neighbors = list(G.neighbors(i))
-            for j in neighbors:
-                if S[j] == 1:
-                    if np.random.rand() < beta:
-                        S[j] = 0
-                        I[j] = 1
-
-    # Recover infected individuals
-    for i in range(n):
-        if I[i] == 1:
-            if np.random.rand() < gamma:
-                I[i] = 0
-                R[i] = 1
+# Read graph file straight into CSR arrays. Matrix Market files and edge
+# lists (any delimiter) are both understood, and node IDs are renumbered
+# 0 .. n-1. The parsed graph is cached next to the file for later runs
+graph = load_graph("texas.mtx")
 
+# Run the SIR model, recording compartment totals per step, or every transition to animate
+rec = simulate(SIR, graph, t_max, seeds=[0], record="events" if animate else "counts", beta=beta, gamma=gamma)
 
-    # Store current states in history arrays
-    S_history[:, t] = S
-    I_history[:, t] = I
-    R_history[:, t] = R
+if animate:
+    # Lay the graph out by its structure (cached next to the graph file) and
+    # show the share of every compartment per pixel, step by step
+    pos = graph_layout(graph, "spectral")
+    renderer = DensityRenderer(graph, pos, SIR.compartments, title="SIR Model", t_max=t_max)
+    ani = renderer.replay(rec)
+    plt.show()
 
 # Plot results
-plt.plot(np.sum(S_history, axis=0), label='Susceptible')
-plt.plot(np.sum(I_history, axis=0), label='Infected')
-plt.plot(np.sum(R_history, axis=0), label='Recovered')
+plt.plot(rec.count("S"), label='Susceptible')
+plt.plot(rec.count("I"), label='Infected')
+plt.plot(rec.count("R"), label='Recovered')
 plt.legend()
 plt.title("SIR Model")
 plt.xlabel('Time')
@@ -0,0 +1,97 @@
+"""Shared simulation engine for the epidemic model scripts.
+
+The scripts in this folder keep their own parameters and plots, and hand the
+expensive parts (graph storage, transmission over edges, the time loop) to
+this package. Models are declared in ``models`` and run with ``simulate``.
+"""
+
+from .cache import load_graph, load_saved_graph, save_graph
+from .density import DensityRenderer
+from .ensemble import ReplicateCountsRecorder, ReplicatedGraph, simulate_ensemble
+from .export import export_animation
+from .generators import GENERATORS, barabasi_albert, newman_watts_strogatz, watts_strogatz
+from .graph import CSRGraph
+from .kernels import as_rng, infect_neighbors, select
+from .layouts import LAYOUTS, graph_layout
+from .mapped import open_mapped_graph, save_mapped_graph
+from .meanfield import MeanFieldCounts, meanfield_sweep, solve_meanfield
+from .models import MODELS, SEIR, SEIRD, SI, SICR, SIR, SIRS, SIRS_V, SIS, Contact, Model, Spontaneous
+from .readers import (
+    compact_ids,
+    iter_edge_chunks,
+    open_text,
+    read_edgelist,
+    read_edgelist_chunked,
+    read_edges,
+    read_graph,
+    read_mtx,
+    sniff_edgelist,
+)
+from .recording import CountsRecorder, EventRecorder, choose_recorder, estimate_history_bytes
+from .rendering import GraphRenderer
+from .runner import run_sweep
+from .sharing import SharedGraph, attach_graph
+from .simulation import simulate
+from .state import ActiveSet, Compartment, Compartments
+from .synthetic import generate_graph, graph_ensemble
+
+__all__ = [
+    "GENERATORS",
+    "LAYOUTS",
+    "MODELS",
+    "SEIR",
+    "SEIRD",
+    "SI",
+    "SICR",
+    "SIR",
+    "SIRS",
+    "SIRS_V",
+    "SIS",
+    "ActiveSet",
+    "CSRGraph",
+    "Compartment",
+    "Compartments",
+    "Contact",
+    "CountsRecorder",
+    "DensityRenderer",
+    "EventRecorder",
+    "GraphRenderer",
+    "MeanFieldCounts",
+    "Model",
+    "ReplicateCountsRecorder",
+    "ReplicatedGraph",
+    "SharedGraph",
+    "Spontaneous",
+    "as_rng",
+    "attach_graph",
+    "barabasi_albert",
+    "choose_recorder",
+    "compact_ids",
+    "estimate_history_bytes",
+    "export_animation",
+    "generate_graph",
+    "graph_ensemble",
+    "graph_layout",
+    "infect_neighbors",
+    "iter_edge_chunks",
+    "load_graph",
+    "load_saved_graph",
+    "meanfield_sweep",
+    "newman_watts_strogatz",
+    "open_mapped_graph",
+    "open_text",
+    "read_edgelist",
+    "read_edgelist_chunked",
+    "read_edges",
+    "read_graph",
+    "read_mtx",
+    "run_sweep",
+    "select",
+    "save_graph",
+    "save_mapped_graph",
+    "simulate",
+    "simulate_ensemble",
+    "sniff_edgelist",
+    "solve_meanfield",
+    "watts_strogatz",
+]
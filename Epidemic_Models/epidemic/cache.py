@@ -0,0 +1,133 @@
+"""Binary on-disk cache of graphs parsed from text edge lists.
+
+The first load of an edge (or Matrix Market) file writes its CSR arrays (indptr, indices and
+the node-ID map) to a ``.csr.npz`` file; later loads read that instead of
+parsing the text again. A cache entry is valid for the same source path,
+size and modification time. If only the modification time changed (the
+file was touched or copied), the content hash decides.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from .graph import CSRGraph
+from .mapped import MAPPED_SUFFIX, open_mapped_graph, save_mapped_graph
+from .readers import read_graph
+
+CACHE_SUFFIX = ".csr.npz"
+
+# Bump when read_graph changes how a file maps to a graph
+READER_VERSION = 3
+
+
+def content_hash(path, chunk_size=1 << 20):
+    """Return the BLAKE2b hex digest of a file's contents."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(path, with_hash=True):
+    """Return the cache key of a source file as a dict."""
+    stat = os.stat(path)
+    key = {"path": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if with_hash:
+        key["hash"] = content_hash(path)
+    return key
+
+
+def cache_path(path, cache_dir=None, mmap=False):
+    """Where the cached CSR of ``path`` is stored.
+
+    Next to the source file by default; inside ``cache_dir`` the name also
+    carries a hash of the source path, so files with the same name from
+    different folders do not collide. Memory-mapped caches are directories
+    ending in ``.csr``.
+    """
+    suffix = MAPPED_SUFFIX if mmap else CACHE_SUFFIX
+    if cache_dir is None:
+        return path + suffix
+    name = os.path.basename(path)
+    tag = hashlib.blake2b(os.path.abspath(path).encode(), digest_size=6).hexdigest()
+    return os.path.join(cache_dir, f"{name}-{tag}{suffix}")
+
+
+def save_graph(graph, path, meta=None):
+    """Write a ``CSRGraph`` (and optional JSON metadata) to an ``.npz`` file."""
+    arrays = {"indptr": graph.indptr, "indices": graph.indices}
+    for key in ("node_ids", "weights"):
+        if getattr(graph, key) is not None:
+            arrays[key] = getattr(graph, key)
+    arrays["meta"] = np.array(json.dumps(meta or {}))
+
+    # Write to a temporary file first so readers never see a partial cache
+    tmp = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp, **arrays)
+    os.replace(tmp, path)
+
+
+def load_saved_graph(path):
+    """Read a file written by ``save_graph``; returns ``(graph, meta)``."""
+    with np.load(path) as data:
+        optional = {key: data[key] if key in data else None for key in ("node_ids", "weights")}
+        graph = CSRGraph(data["indptr"], data["indices"], **optional)
+        meta = json.loads(str(data["meta"]))
+    graph.path = path
+    return graph, meta
+
+
+def _cache_meta(path, options):
+    return {"source": fingerprint(path), "options": options, "reader_version": READER_VERSION}
+
+
+def _cache_status(meta, path, options):
+    """Return "fresh", "touched" (same content, new mtime) or "stale"."""
+    if meta.get("options") != options or meta.get("reader_version") != READER_VERSION:
+        return "stale"
+    key, current = meta.get("source", {}), fingerprint(path, with_hash=False)
+    if any(key.get(field) != current[field] for field in ("path", "size")):
+        return "stale"
+    if key.get("mtime_ns") == current["mtime_ns"]:
+        return "fresh"
+    return "touched" if key.get("hash") == content_hash(path) else "stale"
+
+
+def load_graph(path, cache=True, cache_dir=None, mmap=False, **options):
+    """Load an edge file as a ``CSRGraph``, reusing the binary cache when valid.
+
+    ``options`` are passed to ``read_graph`` and are part of the cache
+    key. With ``cache=False`` the text is always parsed and nothing is
+    written. With ``mmap=True`` the cache is a memory-mapped directory and
+    the returned graph reads its arrays from disk on demand.
+    """
+    if not cache:
+        return read_graph(path, **options)
+
+    save, load = (save_mapped_graph, open_mapped_graph) if mmap else (save_graph, load_saved_graph)
+    target = cache_path(path, cache_dir, mmap)
+    if os.path.exists(target):
+        try:
+            graph, meta = load(target)
+        except (OSError, ValueError, KeyError):
+            graph, meta = None, {}
+        status = "stale" if graph is None else _cache_status(meta, path, options)
+        if status == "touched":
+            # Record the new mtime so the next load skips hashing
+            save(graph, target, _cache_meta(path, options))
+            graph, meta = load(target)
+        if status != "stale":
+            return graph
+
+    graph = read_graph(path, **options)
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+    save(graph, target, _cache_meta(path, options))
+    if mmap:
+        return load(target)[0]
+    graph.path = target
+    return graph
@@ -0,0 +1,152 @@
+"""Density maps of node states, for graphs too large to draw node by node.
+
+``DensityRenderer`` bins the node positions onto a pixel grid once and keeps,
+for every pixel, how many of its nodes are in each compartment. A frame
+shows either the fraction of one compartment per pixel (``show="I"``) or
+the compartment colors mixed by their share of the pixel, so drawing costs
+O(pixels) whatever the number of nodes and edges. Replaying an
+``EventRecorder`` updates the tallies from each step's transitions only,
+which keeps graphs with 10^5 - 10^6 nodes at video frame rates.
+"""
+
+import numpy as np
+
+from .rendering import COLORS, replay_steps, status_text
+from .state import compartment
+
+
+def grid_shape(pos, resolution):
+    """``(rows, cols)`` with ``resolution`` pixels along the longer side of the layout."""
+    span = np.ptp(np.asarray(pos, dtype=float), axis=0)
+    if span.max() == 0:
+        return 1, 1
+    rows, cols = np.maximum(1, np.round(resolution * span[::-1] / span.max())).astype(int)
+    return int(rows), int(cols)
+
+
+def bin_positions(pos, shape):
+    """Return the flat pixel index of every position and the grid extent.
+
+    The grid of ``shape=(rows, cols)`` pixels covers the bounding box of
+    ``pos``; the extent is ``(left, right, bottom, top)`` as ``imshow``
+    takes it.
+    """
+    pos = np.asarray(pos, dtype=float)
+    rows, cols = shape
+    low = pos.min(axis=0)
+    span = np.ptp(pos, axis=0)
+    span[span == 0] = 1.0
+    col = np.minimum(((pos[:, 0] - low[0]) * (cols / span[0])).astype(np.int64), cols - 1)
+    row = np.minimum(((pos[:, 1] - low[1]) * (rows / span[1])).astype(np.int64), rows - 1)
+    return row * cols + col, (low[0], low[0] + span[0], low[1], low[1] + span[1])
+
+
+class DensityRenderer:
+    """Draws per-pixel compartment densities instead of individual nodes.
+
+    Takes the same ``graph, pos, names`` and text options as
+    ``GraphRenderer`` and can stand in for it, e.g.
+    ``export_animation(..., renderer=DensityRenderer)``; edges are not
+    drawn. ``show`` picks one compartment whose fraction per pixel is mapped
+    through ``cmap``; by default every pixel mixes the ``colors`` of its
+    nodes. Pixels without nodes are left blank. ``resolution`` is the number
+    of pixels along the longer side of the layout.
+    """
+
+    def __init__(self, graph, pos, names, ax=None, title=None, t_max=None, colors=None, show=None, cmap="Reds",
+                 resolution=400):
+        from matplotlib.colors import to_rgba_array
+
+        if len(pos) != graph.n:
+            raise ValueError(f"got {len(pos)} positions for a graph with {graph.n} nodes")
+        if ax is None:
+            import matplotlib.pyplot as plt
+
+            ax = plt.gca()
+        self.ax = ax
+        self.names = [compartment(name).name for name in names]
+        self.codes = [int(compartment(name)) for name in names]
+        self.t_max = t_max
+        self.show = None if show is None else int(compartment(show))
+        self.k = max(self.codes) + 1
+
+        self.shape = grid_shape(pos, resolution)
+        self.pixel, extent = bin_positions(pos, self.shape)
+        size = self.shape[0] * self.shape[1]
+        self.population = np.bincount(self.pixel, minlength=size)
+        self.occupied = self.population > 0
+        # Node counts per pixel and state code, and over the whole graph
+        self.tally = np.zeros((size, self.k), dtype=np.int64)
+        self.totals = np.zeros(self.k, dtype=np.int64)
+
+        colors = {**COLORS, **(colors or {})}
+        self.palette = np.zeros((self.k, 3))
+        self.palette[self.codes] = to_rgba_array([colors[name] for name in self.names])[:, :3]
+
+        if self.show is None:
+            self.image = self.ax.imshow(np.zeros(self.shape + (4,)), origin="lower", extent=extent,
+                                        interpolation="nearest", aspect="auto", zorder=1)
+        else:
+            self.image = self.ax.imshow(np.full(self.shape, np.nan), origin="lower", extent=extent, cmap=cmap,
+                                        vmin=0, vmax=1, interpolation="nearest", aspect="auto", zorder=1)
+        self.text = self.ax.text(0.01, 0.99, "", transform=self.ax.transAxes, va="top", zorder=3)
+        if title is not None:
+            self.ax.set_title(title)
+        self.ax.set_axis_off()
+
+    @property
+    def artists(self):
+        """The artists a frame changes, for ``FuncAnimation(blit=True)``."""
+        return self.image, self.text
+
+    def set_state(self, state):
+        """Recount every pixel from the ``uint8`` state vector ``state``."""
+        state = np.asarray(state)
+        self.tally[:] = np.bincount(self.pixel * self.k + state, minlength=self.tally.size).reshape(self.tally.shape)
+        self.totals[:] = np.bincount(state, minlength=self.k)[:self.k]
+
+    def apply(self, nodes, src, dst):
+        """Update the tallies for the transitions ``nodes[i]: src[i] -> dst[i]``."""
+        where = self.pixel[nodes] * self.k
+        flat = self.tally.reshape(-1)
+        np.add.at(flat, where + dst, 1)
+        np.subtract.at(flat, where + src, 1)
+        self.totals += np.bincount(dst, minlength=self.k)[:self.k] - np.bincount(src, minlength=self.k)[:self.k]
+
+    def image_data(self):
+        """Return the current frame as an image array for ``imshow``."""
+        rows, cols = self.shape
+        population = np.maximum(self.population, 1)[:, None]
+        if self.show is not None:
+            fraction = np.where(self.occupied, self.tally[:, self.show] / population[:, 0], np.nan)
+            return fraction.reshape(rows, cols)
+        rgb = (self.tally @ self.palette) / population
+        return np.concatenate((rgb, self.occupied[:, None]), axis=1).reshape(rows, cols, 4)
+
+    def draw(self, state=None, t=None):
+        """Show the state vector ``state`` (or the current tallies) at time step ``t``."""
+        if state is not None:
+            self.set_state(state)
+        self.image.set_data(self.image_data())
+        self.text.set_text(status_text(self.names, self.totals[self.codes], t, self.t_max))
+        return self.artists
+
+    def replay(self, recorder, stride=1, window=None, interval=50, blit=True, **kwargs):
+        """Return a ``FuncAnimation`` replaying the trajectory stored in an ``EventRecorder``.
+
+        As ``GraphRenderer.replay``, but the tallies are rolled forward by
+        the transitions between frames instead of recounting every node.
+        """
+        from matplotlib.animation import FuncAnimation
+
+        steps = replay_steps(recorder, stride, window)
+
+        def frames():
+            self.set_state(recorder.initial)
+            for t, nodes, src, dst in recorder.transitions(steps):
+                self.apply(nodes, src, dst)
+                yield t
+
+        return FuncAnimation(self.ax.figure, lambda t: self.draw(None, t), frames=frames,
+                             init_func=lambda: self.artists, save_count=len(steps), cache_frame_data=False,
+                             interval=interval, blit=blit, **kwargs)
@@ -0,0 +1,254 @@
+"""Headless export of stored epidemics to video, GIF or numbered PNG frames.
+
+Frames are drawn on an off-screen Agg canvas without pyplot: the edges and
+axes are rendered once into a background, and every frame restores that
+background, draws the recolored nodes and the status text, and passes the
+raw pixels straight on to the encoder. Only the frames in flight are held
+in memory, however long the run.
+
+MP4 (and any other video container) is encoded by ffmpeg, found through
+matplotlib's ``animation.ffmpeg_path`` setting. GIFs use ffmpeg when it is
+available and Pillow otherwise. A path such as ``"frames/sir_{:04d}.png"``
+writes one PNG per frame.
+"""
+
+import io
+import os
+import shutil
+import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .rendering import GraphRenderer, replay_steps
+
+
+class FrameCanvas:
+    """An off-screen figure holding a renderer and its static background.
+
+    ``renderer`` is ``GraphRenderer`` or another class taking the same
+    arguments, such as ``DensityRenderer``.
+    """
+
+    def __init__(self, graph, pos, names, figsize=(6.4, 4.8), dpi=100, renderer=GraphRenderer, **options):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.renderer = renderer(graph, pos, names, ax=self.figure.add_subplot(), **options)
+
+        # Draw everything that never changes once
+        for artist in self.renderer.artists:
+            artist.set_animated(True)
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.size = self.canvas.get_width_height()
+
+    def render(self, state, t):
+        """Draw one frame and return its pixels as a ``(height, width, 4)`` uint8 array.
+
+        The array is a view of the canvas and is overwritten by the next
+        frame. ``state=None`` keeps the state of a renderer that is updated
+        with ``apply``.
+        """
+        self.renderer.draw(state, t)
+        self.canvas.restore_region(self.background)
+        for artist in self.renderer.artists:
+            self.renderer.ax.draw_artist(artist)
+        return np.asarray(self.canvas.buffer_rgba())
+
+    def frames(self, recorder, steps, state=None, start=0):
+        """Yield the pixels of every step in ``steps`` of a stored run, as ``render`` does.
+
+        Renderers with an ``apply`` method (``DensityRenderer``) are rolled
+        forward by the transitions between frames; others are given the
+        replayed state vector. With the ``state`` at step ``start`` the
+        replay resumes from there rather than from the initial state.
+        """
+        if hasattr(self.renderer, "apply"):
+            self.renderer.set_state(recorder.initial if state is None else state)
+            for t, nodes, src, dst in recorder.transitions(steps, start):
+                self.renderer.apply(nodes, src, dst)
+                yield self.render(None, t)
+        else:
+            for t, state in recorder.replay(steps, state, start):
+                yield self.render(state, t)
+
+
+def frame_size(figsize, dpi):
+    """Pixel ``(width, height)`` of frames drawn at ``figsize`` and ``dpi``."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    return FigureCanvasAgg(Figure(figsize=figsize, dpi=dpi)).get_width_height()
+
+
+def find_ffmpeg():
+    """Return the path of the ffmpeg executable, or ``None``."""
+    from matplotlib import rcParams
+
+    return shutil.which(rcParams["animation.ffmpeg_path"])
+
+
+class FFmpegSink:
+    """Pipe raw RGBA frames into an ffmpeg process encoding ``path``."""
+
+    def __init__(self, path, size, fps):
+        ffmpeg = find_ffmpeg()
+        if ffmpeg is None:
+            raise RuntimeError(f"writing {path} needs ffmpeg, which was not found")
+        command = [ffmpeg, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgba",
+                   "-s", "{}x{}".format(*size), "-r", str(fps), "-i", "-"]
+        if path.lower().endswith(".gif"):
+            command += ["-filter_complex", "split[a][b];[a]palettegen[p];[b][p]paletteuse"]
+        else:
+            # Common H.264 players need even frame sizes and 4:2:0 chroma
+            command += ["-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p"]
+        self.path = path
+        self.process = subprocess.Popen(command + [path], stdin=subprocess.PIPE)
+
+    @staticmethod
+    def encode(frame, fps):
+        return np.ascontiguousarray(frame).tobytes()
+
+    def write(self, data):
+        self.process.stdin.write(data)
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed while writing {self.path}")
+
+
+class GifSink:
+    """Write an animated GIF with Pillow, one frame at a time.
+
+    Every frame carries its own palette, so frames are encoded independently
+    (in parallel, with several workers) and only appended here.
+    """
+
+    def __init__(self, path, size, fps):
+        from PIL import GifImagePlugin, Image
+
+        # The screen size comes from this header; each frame has its own palette
+        self.file = open(path, "wb")
+        header, _ = GifImagePlugin.getheader(Image.new("P", size), info={"loop": 0})
+        self.file.writelines(header)
+
+    @staticmethod
+    def encode(frame, fps):
+        from PIL import GifImagePlugin, Image
+
+        image = Image.fromarray(np.ascontiguousarray(frame[..., :3]))
+        image = image.quantize(256, method=Image.Quantize.FASTOCTREE)
+        return b"".join(GifImagePlugin.getdata(image, duration=1000 / fps, include_color_table=True))
+
+    def write(self, data):
+        self.file.write(data)
+
+    def close(self):
+        self.file.write(b";")
+        self.file.close()
+
+
+class PNGSink:
+    """Write every frame to ``pattern.format(index)``."""
+
+    def __init__(self, pattern, size, fps):
+        if pattern.format(0) == pattern:
+            raise ValueError(f"PNG export needs a numbered file pattern such as 'frames/{{:04d}}.png', got {pattern!r}")
+        self.pattern = pattern
+        self.index = 0
+
+    @staticmethod
+    def encode(frame, fps):
+        from PIL import Image
+
+        data = io.BytesIO()
+        Image.fromarray(np.ascontiguousarray(frame)).save(data, format="png")
+        return data.getvalue()
+
+    def write(self, data):
+        path = self.pattern.format(self.index)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        self.index += 1
+
+    def close(self):
+        pass
+
+
+def sink_type(path):
+    """Return the sink class that writes ``path``, chosen by its extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".png":
+        return PNGSink
+    if extension == ".gif" and find_ffmpeg() is None:
+        return GifSink
+    return FFmpegSink
+
+
+# Set in every worker process by _init_worker
+_worker_canvas = None
+_worker_recorder = None
+_worker_encode = None
+
+
+def _init_worker(recorder, graph, pos, names, encode, options):
+    global _worker_canvas, _worker_recorder, _worker_encode
+    _worker_canvas = FrameCanvas(graph, pos, names, **options)
+    _worker_recorder = recorder
+    _worker_encode = encode
+
+
+def _render_task(task):
+    steps, state, fps = task
+    frames = _worker_canvas.frames(_worker_recorder, steps, state, start=steps[0])
+    return [_worker_encode(frame, fps) for frame in frames]
+
+
+def export_animation(recorder, path, graph, pos, names, stride=1, window=None, fps=20, workers=1, chunk=8,
+                     **options):
+    """Render the run stored in an ``EventRecorder`` to ``path`` without a display.
+
+    ``stride`` and ``window`` select steps as in ``GraphRenderer.replay``.
+    ``options`` go to the renderer (``title``, ``t_max``, ``colors``, ...),
+    which is ``GraphRenderer`` unless ``renderer=DensityRenderer`` is
+    passed, and to the figure (``figsize``, ``dpi``). With ``workers > 1``,
+    runs of ``chunk`` consecutive frames are drawn in worker processes and
+    written in order as they complete, with at most two runs per worker in
+    flight. The main process rolls the state forward once to hand every run
+    its starting state, and writes the encoded frames out in order.
+    Returns the number of frames written.
+    """
+    steps = replay_steps(recorder, stride, window)
+    sink_class = sink_type(path)
+    if workers == 1:
+        canvas = FrameCanvas(graph, pos, names, **options)
+        sink = sink_class(path, canvas.size, fps)
+        try:
+            for frame in canvas.frames(recorder, steps):
+                sink.write(sink_class.encode(frame, fps))
+        finally:
+            sink.close()
+        return len(steps)
+
+    sink = sink_class(path, frame_size(options.get("figsize", (6.4, 4.8)), options.get("dpi", 100)), fps)
+    chunks = [steps[i:i + chunk] for i in range(0, len(steps), chunk)]
+    limit = 2 * (workers or os.cpu_count())
+    try:
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(recorder, graph, pos, names, sink_class.encode, options)) as pool:
+            pending = deque()
+            starts = recorder.replay([run[0] for run in chunks])
+            for run, (_, state) in zip(chunks, starts):
+                pending.append(pool.submit(_render_task, (run, state.copy(), fps)))
+                while len(pending) > limit or (run is chunks[-1] and pending):
+                    for data in pending.popleft().result():
+                        sink.write(data)
+    finally:
+        sink.close()
+    return len(steps)
@@ -0,0 +1,189 @@
+"""Synthetic contact graphs built with array operations, straight into CSR.
+
+These follow the networkx generators the animated scripts use
+(``barabasi_albert_graph``, ``watts_strogatz_graph`` and
+``newman_watts_strogatz_graph``) with the same ``n, m, k, p`` parameters, but
+draw all random choices in bulk so a graph with millions of nodes takes
+seconds. ``seed`` is anything ``np.random.default_rng`` accepts; the same
+seed always gives the same graph.
+"""
+
+import numpy as np
+
+from .graph import CSRGraph
+
+# Give up on an edge that still collides after this many redraws
+MAX_REDRAWS = 100
+
+
+def complete_graph(n):
+    """Graph with an edge between every pair of the ``n`` nodes."""
+    src, dst = np.triu_indices(n, k=1)
+    return CSRGraph.from_edges(src, dst, n=n)
+
+
+def ring_lattice(n, k):
+    """Edges joining every node to its ``k // 2`` next nodes around a ring."""
+    offsets = np.repeat(np.arange(1, k // 2 + 1, dtype=np.int64), n)
+    src = np.tile(np.arange(n, dtype=np.int64), k // 2)
+    return src, (src + offsets) % n
+
+
+def _collisions(src, dst, movable, n):
+    """Movable edges that repeat an edge which wins over them, fixed edges winning first."""
+    keys = np.minimum(src, dst) * n + np.maximum(src, dst)
+    order = np.lexsort((movable, keys))
+    repeat = np.zeros(len(keys), dtype=bool)
+    repeat[order[1:]] = keys[order[1:]] == keys[order[:-1]]
+    return movable & repeat
+
+
+def _redraw_targets(src, dst, movable, n, rng, fallback, avoid=None):
+    """Redraw movable edge targets until no edge is a self loop or a repeat.
+
+    Fixed edges always win a collision with a movable one. Targets that still
+    collide after ``MAX_REDRAWS`` rounds (only possible when ``src`` is linked
+    to almost every node) are set to ``fallback`` and become fixed; movable
+    edges that the fallbacks then collide with fall back in turn, so no edge
+    is ever lost to a merge.
+    """
+    dst = dst.copy()
+    for _ in range(MAX_REDRAWS):
+        bad = _collisions(src, dst, movable, n) | (movable & (src == dst))
+        if avoid is not None:
+            bad |= movable & (dst == avoid)
+        if not bad.any():
+            return dst
+        dst[bad] = rng.integers(0, n, bad.sum())
+
+    movable = movable.copy()
+    while bad.any():
+        dst[bad] = fallback[bad]
+        movable &= ~bad
+        bad = _collisions(src, dst, movable, n)
+    return dst
+
+
+def barabasi_albert(n, m, seed=None):
+    """Barabasi-Albert preferential attachment graph.
+
+    As in networkx, growth starts from a star on ``m + 1`` nodes and every
+    new node links to ``m`` distinct nodes drawn from the list of all edge
+    endpoints so far, i.e. with probability proportional to degree. That
+    list grows by ``2 * m`` entries per node (its targets, then itself
+    ``m`` times), so a target is just a random position in the part of the
+    list that existed before its node arrived. Nodes are handled in blocks
+    of growing size: all draws of a block are made at once and positions
+    that fall inside the block are followed until they reach a known node.
+    The rare node whose targets repeat is redrawn one target at a time,
+    after which the nodes behind it are resolved again.
+    """
+    if m < 1 or m >= n:
+        raise ValueError(f"Barabasi-Albert network must have m >= 1 and m < n, m = {m}, n = {n}")
+    rng = np.random.default_rng(seed)
+    new_nodes = np.arange(m + 1, n, dtype=np.int64)
+    width = 2 * m
+
+    # Endpoint list: the star (hub m times, leaves once), then per new node
+    # its m targets followed by m copies of itself. Row j of ``slots`` holds
+    # the positions of the targets of node m + 1 + j.
+    endpoints = np.empty(width * (len(new_nodes) + 1), dtype=np.int64)
+    endpoints[:m] = 0
+    endpoints[m:width] = np.arange(1, m + 1)
+    starts = width * np.arange(1, len(new_nodes) + 1, dtype=np.int64)
+    slots = starts[:, None] + np.arange(m)
+    endpoints[slots + m] = new_nodes[:, None]
+
+    first = 0
+    while first < len(new_nodes):
+        last = min(len(new_nodes), first + max(256, first // 4))
+        draws = (rng.random((last - first, m)) * starts[first:last, None]).astype(np.int64)
+        row = first
+        while row < last:
+            # Follow positions that land on targets not decided yet
+            where = draws[row - first:].flatten()
+            pending = (where >= starts[row]) & (where % width < m)
+            while pending.any():
+                hit = where[pending]
+                where[pending] = draws[hit // width - 1 - first, hit % width]
+                pending[pending] = (where[pending] >= starts[row]) & (where[pending] % width < m)
+            targets = endpoints[where].reshape(-1, m)
+
+            ranked = np.sort(targets, axis=1)
+            repeats = np.flatnonzero((ranked[:, 1:] == ranked[:, :-1]).any(axis=1))
+            done = row + (repeats[0] if len(repeats) else len(targets))
+            endpoints[slots[row:done]] = targets[:done - row]
+            if done == last:
+                break
+
+            # Draw again for the first repeated target, with every earlier node settled
+            chosen = []
+            for target in targets[done - row]:
+                while target in chosen:
+                    target = endpoints[int(rng.random() * starts[done])]
+                chosen.append(target)
+            endpoints[slots[done]] = chosen
+            row = done + 1
+        first = last
+
+    src = np.concatenate((np.zeros(m, dtype=np.int64), np.repeat(new_nodes, m)))
+    dst = np.concatenate((np.arange(1, m + 1), endpoints[slots].ravel()))
+    return CSRGraph.from_edges(src, dst, n=n)
+
+
+def watts_strogatz(n, k, p, seed=None):
+    """Watts-Strogatz small-world graph.
+
+    A ring lattice where every node links to its ``k // 2`` nearest
+    neighbors on each side, after which each lattice edge ``(u, v)`` is
+    rewired to ``(u, w)`` with probability ``p``, ``w`` chosen uniformly
+    among the nodes that are neither ``u`` nor already linked to it.
+
+    A rewire that finds no free target keeps its lattice edge, so the graph
+    always has ``n * k / 2`` edges as in networkx. The degree spread matches
+    networkx's up to nearly complete graphs (``k`` within a few of ``n``),
+    where drawing all rewires together spreads degrees wider than its
+    edge-by-edge rewiring.
+    """
+    if k > n:
+        raise ValueError("k>n, choose smaller k or larger n")
+    if k == n:
+        return complete_graph(n)
+    rng = np.random.default_rng(seed)
+    src, dst = ring_lattice(n, k)
+
+    rewire = rng.random(len(src)) < p
+    moved = dst.copy()
+    moved[rewire] = rng.integers(0, n, rewire.sum())
+    moved = _redraw_targets(src, moved, rewire, n, rng, fallback=dst, avoid=np.where(rewire, dst, -1))
+    return CSRGraph.from_edges(src, moved, n=n)
+
+
+def newman_watts_strogatz(n, k, p, seed=None):
+    """Newman-Watts-Strogatz small-world graph.
+
+    The ring lattice of ``watts_strogatz`` is kept whole and, for each
+    lattice edge ``(u, v)``, a shortcut ``(u, w)`` to a uniformly chosen new
+    neighbor ``w`` is added with probability ``p``.
+    """
+    if k > n:
+        raise ValueError("k>=n, choose smaller k or larger n")
+    if k == n:
+        return complete_graph(n)
+    rng = np.random.default_rng(seed)
+    src, dst = ring_lattice(n, k)
+
+    extra = src[rng.random(len(src)) < p]
+    src = np.concatenate((src, extra))
+    dst = np.concatenate((dst, rng.integers(0, n, len(extra))))
+    movable = np.arange(len(src)) >= len(src) - len(extra)
+    # Shortcuts that find no free node become self loops, which are dropped
+    dst = _redraw_targets(src, dst, movable, n, rng, fallback=src)
+    return CSRGraph.from_edges(src, dst, n=n)
+
+
+GENERATORS = {
+    "barabasi_albert": barabasi_albert,
+    "watts_strogatz": watts_strogatz,
+    "newman_watts_strogatz": newman_watts_strogatz,
+}
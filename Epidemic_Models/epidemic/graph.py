@@ -0,0 +1,148 @@
+"""Compressed sparse row (CSR) storage for undirected contact graphs."""
+
+import numpy as np
+
+from .state import index_dtype
+
+
+def _index_array(values):
+    """View ``values`` as an integer array without copying integer input.
+
+    Integer arrays, including ``np.memmap`` ones, are kept as they are so a
+    memory-mapped graph stays on disk.
+    """
+    values = np.asarray(values)
+    return values if values.dtype.kind in "iu" else values.astype(np.int64)
+
+
+class CSRGraph:
+    """Undirected graph stored as two flat index arrays.
+
+    The neighbors of node ``i`` are ``indices[indptr[i]:indptr[i + 1]]``.
+    Every undirected edge is stored in both directions, so ``indices`` has
+    ``2 * number_of_edges`` entries. ``indices`` uses int32 when the node
+    count allows it; either array may be an ``np.memmap``.
+
+    ``node_ids`` optionally maps each index back to the node ID used in the
+    source file (sorted, as produced by ``readers.compact_ids``); ``None``
+    means the IDs are the indices themselves. ``weights``, when present, is
+    aligned with ``indices`` and holds one value per stored edge direction.
+    ``path`` is the cache file the graph was loaded from or saved to, if
+    any; derived data such as layouts is stored next to it.
+    """
+
+    def __init__(self, indptr, indices, node_ids=None, weights=None):
+        self.indptr = _index_array(indptr)
+        self.indices = _index_array(indices)
+        self.n = len(self.indptr) - 1
+        self.node_ids = node_ids
+        self.weights = weights
+        self.path = None
+
+    @classmethod
+    def from_edges(cls, src, dst, n=None, weights=None):
+        """Build a graph from two arrays of edge endpoints.
+
+        Edges are symmetrized, self loops are dropped and duplicate edges are
+        merged (keeping the weight of the first occurrence). Nodes must
+        already be numbered ``0 .. n - 1``.
+        """
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        if n is None:
+            n = int(max(src.max(initial=-1), dst.max(initial=-1))) + 1
+
+        # Store both directions and drop self loops
+        keep = src != dst
+        rows = np.concatenate((src[keep], dst[keep]))
+        cols = np.concatenate((dst[keep], src[keep]))
+
+        # Sort by (row, col) and merge duplicates in one pass
+        keys = rows * n + cols
+        if weights is None:
+            keys = np.sort(keys)
+        else:
+            weights = np.asarray(weights)[keep]
+            order = np.argsort(keys, kind="stable")
+            keys = keys[order]
+            weights = np.concatenate((weights, weights))[order]
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = keys[1:] != keys[:-1]
+        keys = keys[first]
+        rows = keys // n
+        cols = keys % n
+
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        return cls(indptr, cols.astype(index_dtype(n)), weights=None if weights is None else weights[first])
+
+    @classmethod
+    def from_networkx(cls, G):
+        """Build a graph from a networkx graph whose nodes are ``0 .. n - 1``."""
+        n = G.number_of_nodes()
+        edges = np.array(list(G.edges()), dtype=np.int64).reshape(-1, 2)
+        return cls.from_edges(edges[:, 0], edges[:, 1], n)
+
+    def index_of(self, ids):
+        """Return the node indices of the given source-file node IDs (a scalar or an array)."""
+        ids = np.asarray(ids)
+        if self.node_ids is None:
+            return ids
+        flat = np.atleast_1d(ids)
+        index = np.searchsorted(self.node_ids, flat)
+        found = index < self.n
+        found[found] = self.node_ids[index[found]] == flat[found]
+        if not found.all():
+            raise KeyError(f"unknown node IDs: {flat[~found][:5].tolist()}")
+        return index.reshape(ids.shape)
+
+    def ids_of(self, nodes):
+        """Return the source-file node IDs of the given node indices."""
+        if self.node_ids is None:
+            return np.asarray(nodes)
+        return self.node_ids[nodes]
+
+    def number_of_nodes(self):
+        return self.n
+
+    def number_of_edges(self):
+        return len(self.indices) // 2
+
+    def degree(self):
+        """Return the degree of every node as an array."""
+        return np.diff(self.indptr)
+
+    def adjacency(self):
+        """Return the adjacency matrix as a ``scipy.sparse.csr_array`` sharing the index arrays."""
+        import scipy.sparse
+
+        data = np.ones(len(self.indices)) if self.weights is None else np.asarray(self.weights, dtype=float)
+        return scipy.sparse.csr_array((data, self.indices, self.indptr), shape=(self.n, self.n))
+
+    def degree_of(self, nodes):
+        """Return the degree of the given nodes."""
+        return self.indptr[nodes + 1] - self.indptr[nodes]
+
+    def population_fraction(self, members, nodes):
+        """Fraction of the population of each of ``nodes`` made up by ``members``.
+
+        A single graph is one population, so this is ``len(members) / n``.
+        """
+        return len(members) / self.n
+
+    def neighbors(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def gather_neighbors(self, nodes):
+        """Return the concatenated neighbor lists of ``nodes``."""
+        nodes = np.asarray(nodes, dtype=np.int64)
+        starts = self.indptr[nodes]
+        counts = self.indptr[nodes + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+
+        # Offset of each edge slot inside its own node's slice
+        ends = np.cumsum(counts)
+        positions = np.arange(total) + np.repeat(starts - (ends - counts), counts)
+        return self.indices[positions]
@@ -0,0 +1,80 @@
+"""Vectorized transition kernels used by the model scripts."""
+
+import numpy as np
+
+from .state import Compartment
+
+
+def as_rng(rng):
+    """Return a random source for the kernels.
+
+    ``None`` keeps the global ``np.random`` state the scripts always used; a
+    ``Generator`` is used as is; anything else (an int seed or a
+    ``SeedSequence``) seeds a new ``Generator``.
+    """
+    if rng is None or isinstance(rng, np.random.Generator):
+        return np.random if rng is None else rng
+    return np.random.default_rng(rng)
+
+
+def infect_neighbors(graph, state, infected, beta, rng=None, susceptible=Compartment.S, mode="edge"):
+    """Infect susceptible neighbors of infected nodes in one batched step.
+
+    ``mode`` selects the force of infection on a susceptible node with ``k``
+    infected neighbors:
+
+    - ``"edge"``: every S-I edge transmits independently with probability
+      ``beta``, so the node is infected with probability
+      ``1 - (1 - beta) ** k``.
+    - ``"prevalence"``: as ``"edge"`` with the per-edge probability scaled by
+      the infected fraction, ``beta * n_infected / n``. This is the exposure
+      term of the SEIR/SEIRD scripts, computed once per step from the
+      number of infected nodes.
+    - ``"frequency"``: frequency-dependent transmission, probability
+      ``beta * k / degree``.
+
+    Only one random number is drawn per susceptible node at risk instead of
+    one per edge.
+
+    ``state`` is the ``uint8`` state vector and nodes whose code equals
+    ``susceptible`` can be infected. ``infected`` is either a boolean mask or
+    an array of infected node indices; passing the indices (e.g.
+    ``Compartments["I"].nodes``) makes the step cost
+    O(infected + incident edges) instead of O(n).
+
+    Returns the indices of the newly infected nodes; the caller applies the
+    state change, so the same kernel serves S -> I and S -> E transitions.
+    """
+    if mode not in ("edge", "prevalence", "frequency"):
+        raise ValueError(f"unknown infection mode {mode!r}")
+    if rng is None:
+        rng = np.random
+
+    infected = np.asarray(infected)
+    sources = np.flatnonzero(infected) if infected.dtype == bool else infected
+    targets = graph.gather_neighbors(sources)
+    targets = targets[state[targets] == susceptible]
+    if len(targets) == 0:
+        return targets
+
+    # Number of infected neighbors of every susceptible node at risk
+    at_risk, k = np.unique(targets, return_counts=True)
+    if mode == "edge":
+        p = 1.0 - (1.0 - beta) ** k
+    elif mode == "prevalence":
+        p = 1.0 - (1.0 - beta * graph.population_fraction(sources, at_risk)) ** k
+    else:
+        p = beta * k / graph.degree_of(at_risk)
+    return at_risk[rng.random(len(at_risk)) < p]
+
+
+def select(nodes, p, rng=None):
+    """Return the members of ``nodes`` that make a transition with probability ``p``.
+
+    Used for the spontaneous transitions (recovery, waning immunity,
+    vaccination, ...), which only need to look at one compartment.
+    """
+    if rng is None:
+        rng = np.random
+    nodes = np.asarray(nodes)
+    return nodes[rng.random(len(nodes)) < p]
@@ -0,0 +1,149 @@
+"""Node positions for drawing a graph, computed once and kept on disk.
+
+A layout depends only on the graph, the algorithm and (for randomized
+algorithms) the seed, so ``graph_layout`` stores it next to the graph's
+cache file and every later animation of that graph reads it back instead
+of laying the graph out again. Positions are an ``(n, 2)`` float array
+indexed like the graph's nodes.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+LAYOUT_SUFFIX = ".layout.npz"
+
+
+def rescale(pos, scale=1.0):
+    """Center ``pos`` and scale it to fit in ``[-scale, scale]``, keeping the aspect."""
+    pos = pos - pos.mean(axis=0)
+    lim = np.abs(pos).max(initial=0)
+    if lim > 0:
+        pos *= scale / lim
+    return pos
+
+
+def spiral_layout(graph, seed=None, resolution=0.35):
+    """Nodes in index order along an Archimedean spiral, as ``nx.spiral_layout``."""
+    if graph.n == 1:
+        return np.zeros((1, 2))
+    dist = np.arange(graph.n, dtype=float)
+    angle = resolution * dist
+    return rescale(np.column_stack((dist * np.cos(angle), dist * np.sin(angle))))
+
+
+def random_layout(graph, seed=None):
+    """Positions drawn uniformly from the unit square, as ``nx.random_layout``."""
+    return np.random.default_rng(seed).random((graph.n, 2))
+
+
+def spectral_layout(graph, seed=None, tol=1e-2):
+    """Positions from the leading nontrivial eigenvectors of the normalized adjacency.
+
+    The adjacency is regularized by spreading a weight of ``tau`` (the mean
+    degree) evenly over all pairs of nodes, which keeps small components
+    and dangling trees from taking over the leading eigenvectors. The top
+    eigenvector of that matrix is known and projected out, so
+    ``scipy.sparse.linalg.eigsh`` only has to find the next two. The ARPACK
+    start vector is fixed, so ``seed`` is not used.
+
+    The default ``tol`` is loose so that a graph with 10^6 nodes takes
+    seconds. The vectors it gives are only approximate: where the leading
+    eigenvalues are close together or repeated, as in ring lattices and
+    other graphs without shortcuts, they are mixtures of several
+    eigenvectors and the large-scale shape (e.g. the ring) is blurred.
+    ``tol=0`` solves to machine precision at a cost that grows quickly with
+    the size of such graphs (about a second for a 2000-node ring).
+    """
+    import scipy.sparse.linalg
+
+    n = graph.n
+    if n < 4:
+        return spiral_layout(graph)
+    adjacency = graph.adjacency()
+    degree = np.asarray(adjacency.sum(axis=1))
+    tau = max(degree.mean(), 1.0)
+    scale = 1 / np.sqrt(degree + tau)
+    top = np.sqrt(degree + tau)
+    top /= np.linalg.norm(top)
+
+    def matvec(x):
+        x = x.reshape(n, -1) * scale[:, None]
+        y = scale[:, None] * (adjacency @ x + tau / n * x.sum(axis=0))
+        return y - top[:, None] * (top @ y)
+
+    operator = scipy.sparse.linalg.LinearOperator((n, n), matvec=matvec, matmat=matvec, dtype=float)
+    start = np.random.default_rng(0).random(n)
+    _, vectors = scipy.sparse.linalg.eigsh(operator, k=2, which="LA", tol=tol, v0=start)
+    return rescale(vectors[:, ::-1] * scale[:, None])
+
+
+def spring_layout(graph, seed=None):
+    """Fruchterman-Reingold force-directed positions from ``nx.spring_layout``."""
+    import networkx as nx
+
+    rows = np.repeat(np.arange(graph.n), graph.degree())
+    upper = rows < graph.indices
+    G = nx.Graph()
+    G.add_nodes_from(range(graph.n))
+    G.add_edges_from(zip(rows[upper].tolist(), np.asarray(graph.indices)[upper].tolist()))
+    pos = nx.spring_layout(G, seed=seed)
+    return np.array([pos[i] for i in range(graph.n)])
+
+
+LAYOUTS = {
+    "spiral": spiral_layout,
+    "random": random_layout,
+    "spring": spring_layout,
+    "spectral": spectral_layout,
+}
+
+# Layouts that ignore the seed, so one cached copy serves every seed
+DETERMINISTIC_LAYOUTS = {"spiral", "spectral"}
+
+
+def graph_hash(graph):
+    """Return a BLAKE2b hex digest of the graph's structure."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(graph.indptr, dtype=np.int64))
+    digest.update(np.ascontiguousarray(graph.indices, dtype=np.int64))
+    return digest.hexdigest()
+
+
+def layout_path(graph_path, algorithm, seed=None):
+    """Where the layout of the graph cached at ``graph_path`` is stored."""
+    key = algorithm if algorithm in DETERMINISTIC_LAYOUTS else f"{algorithm}-seed{seed}"
+    return f"{graph_path}.{key}{LAYOUT_SUFFIX}"
+
+
+def graph_layout(graph, algorithm="spiral", seed=None, cache=True):
+    """Return node positions of ``graph``, reusing the stored layout when valid.
+
+    The layout is cached when the graph has a cache file (``graph.path``,
+    set by ``load_graph`` and ``generate_graph``) and is reproducible, i.e.
+    the algorithm is deterministic or ``seed`` is given. A stored layout is
+    used only if it was computed for the same graph structure.
+    """
+    if algorithm not in LAYOUTS:
+        raise ValueError(f"unknown layout {algorithm!r}")
+    reproducible = algorithm in DETERMINISTIC_LAYOUTS or seed is not None
+    if not (cache and reproducible and graph.path is not None):
+        return LAYOUTS[algorithm](graph, seed=seed)
+
+    target = layout_path(graph.path, algorithm, seed)
+    meta = {"algorithm": algorithm, "seed": seed, "graph": graph_hash(graph)}
+    if os.path.exists(target):
+        try:
+            with np.load(target) as data:
+                if json.loads(str(data["meta"])) == meta:
+                    return data["positions"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    positions = LAYOUTS[algorithm](graph, seed=seed)
+    tmp = f"{target}.{os.getpid()}.tmp.npz"
+    np.savez(tmp, positions=positions, meta=np.array(json.dumps(meta)))
+    os.replace(tmp, target)
+    return positions
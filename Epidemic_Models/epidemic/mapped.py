@@ -0,0 +1,67 @@
+"""Memory-mapped CSR graphs for networks larger than RAM.
+
+A mapped graph is a directory of raw ``.npy`` arrays::
+
+    graph.csr/
+        indptr.npy    int64, n + 1 entries
+        indices.npy   int32 or int64, 2 * number_of_edges entries
+        node_ids.npy  optional map back to the source node IDs
+        weights.npy   optional edge weights, aligned with indices
+        meta.json     free-form metadata (e.g. the source fingerprint)
+
+``open_mapped_graph`` opens the arrays with ``np.load(mmap_mode="r")``, so
+the kernels page adjacency in from disk on demand, and several processes
+opening the same directory share the page cache instead of each holding a
+copy.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from .graph import CSRGraph
+
+MAPPED_SUFFIX = ".csr"
+
+
+def save_mapped_graph(graph, path, meta=None):
+    """Write ``graph`` as a memory-mappable directory at ``path``."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    os.makedirs(tmp, exist_ok=True)
+    np.save(os.path.join(tmp, "indptr.npy"), graph.indptr)
+    np.save(os.path.join(tmp, "indices.npy"), graph.indices)
+    for key in ("node_ids", "weights"):
+        if getattr(graph, key) is not None:
+            np.save(os.path.join(tmp, f"{key}.npy"), getattr(graph, key))
+    with open(os.path.join(tmp, "meta.json"), "w") as f:
+        json.dump(meta or {}, f)
+
+    # Swap the finished directory in so readers never see a partial graph
+    if os.path.isdir(path):
+        old = f"{path}.{os.getpid()}.old"
+        os.replace(path, old)
+        os.replace(tmp, path)
+        for name in os.listdir(old):
+            os.remove(os.path.join(old, name))
+        os.rmdir(old)
+    else:
+        os.replace(tmp, path)
+
+
+def open_mapped_graph(path):
+    """Open a directory written by ``save_mapped_graph``; returns ``(graph, meta)``.
+
+    The arrays are read-only memory maps.
+    """
+    indptr = np.load(os.path.join(path, "indptr.npy"), mmap_mode="r")
+    indices = np.load(os.path.join(path, "indices.npy"), mmap_mode="r")
+    optional = {}
+    for key in ("node_ids", "weights"):
+        array_path = os.path.join(path, f"{key}.npy")
+        optional[key] = np.load(array_path, mmap_mode="r") if os.path.exists(array_path) else None
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    graph = CSRGraph(indptr, indices, **optional)
+    graph.path = path
+    return graph, meta
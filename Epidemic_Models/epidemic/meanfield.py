@@ -0,0 +1,113 @@
+"""Deterministic mean-field approximation of the compartment models.
+
+Every ``Model`` doubles as a system of ODEs for the fraction of nodes in
+each compartment: each transition contributes the flow it declares in
+``flows``, with per-step probabilities turned into rates (``hazard``) and
+contacts drawn from a homogeneous graph of the same mean degree. Solving it
+with ``scipy.integrate.solve_ivp`` takes milliseconds, so thousands of
+parameter points can be screened before any stochastic run.
+
+The approximation ignores correlations between neighbors (clustering,
+depletion of susceptibles around an infected node) and the order of the
+phases within a step, so on sparse graphs its outbreaks start earlier and
+peak higher than the simulated ones; it ranks parameter points, it does
+not replace the simulation.
+
+>>> rec = solve_meanfield(SIR, graph, t_max, beta=0.02, gamma=0.05)
+>>> plt.plot(rec.count("I"))
+"""
+
+import numpy as np
+
+from .state import compartment
+
+
+class MeanFieldCounts:
+    """Expected compartment sizes per step, read like a ``CountsRecorder``."""
+
+    def __init__(self, codes, counts):
+        self.codes = list(codes)
+        self._counts = counts
+        self.steps = len(counts)
+
+    def counts(self):
+        """Return a ``(steps, n_compartments)`` array of compartment sizes."""
+        return self._counts
+
+    def count(self, name):
+        """Return the size of one compartment at every step."""
+        return self._counts[:, self.codes.index(compartment(name))]
+
+
+def meanfield_derivative(model, mean_degree, **params):
+    """Return ``f(t, y)``, the time derivative of the compartment fractions ``y``.
+
+    ``y`` is ordered like ``model.compartments``.
+    """
+    model.check_parameters(params)
+    codes = [int(code) for code in model.compartments]
+    flows = [transition.flows(params, mean_degree) for transition in model.transitions]
+    x = np.zeros(max(codes) + 1)
+
+    def derivative(t, y):
+        x[codes] = y
+        dx = np.zeros_like(x)
+        for flow in flows:
+            for src, dst, rate in flow(x):
+                dx[src] -= rate
+                dx[dst] += rate
+        return dx[codes]
+
+    return derivative
+
+
+def _population(graph, mean_degree):
+    """Node count and mean degree of ``graph``, which may also be a plain node count."""
+    if isinstance(graph, (int, np.integer)):
+        if mean_degree is None:
+            raise ValueError("mean_degree is needed when graph is a node count")
+        return int(graph), mean_degree
+    return graph.n, graph.degree().mean() if mean_degree is None else mean_degree
+
+
+def solve_meanfield(model, graph, t_max, seeds=(0,), mean_degree=None, method="LSODA", **params):
+    """Solve the mean-field ODEs of ``model`` and return the expected counts.
+
+    Takes the arguments of ``simulate``: ``graph`` supplies the node count
+    and mean degree (or pass a node count and ``mean_degree``), and
+    the distinct ``seeds`` start in the model's seed state. The result holds
+    ``t_max`` steps of (fractional) compartment sizes, with the same
+    ``counts()`` and ``count(name)`` as the stochastic recorders.
+    """
+    from scipy.integrate import solve_ivp
+
+    n, mean_degree = _population(graph, mean_degree)
+    codes = list(model.compartments)
+    seeded = len(np.unique(np.asarray(seeds, dtype=np.int64))) / n
+    y0 = np.zeros(len(codes))
+    y0[codes.index(model.initial)] = 1.0 - seeded
+    y0[codes.index(model.seed_state)] += seeded
+
+    if t_max <= 1:
+        # Only the initial state is recorded, as in simulate
+        return MeanFieldCounts(codes, n * np.repeat(y0[None], t_max, axis=0))
+
+    steps = np.arange(t_max)
+    solution = solve_ivp(meanfield_derivative(model, mean_degree, **params), (0, t_max - 1), y0,
+                         method=method, t_eval=steps, rtol=1e-6, atol=1e-9)
+    if not solution.success:
+        raise RuntimeError(f"{model.name}: mean-field solver failed: {solution.message}")
+    return MeanFieldCounts(codes, n * solution.y.T)
+
+
+def meanfield_sweep(model, graph, t_max, points, seeds=(0,), mean_degree=None, method="LSODA"):
+    """Solve the mean-field ODEs for every parameter point.
+
+    ``points`` is a list of parameter dicts as for ``run_sweep``. Returns a
+    ``(len(points), t_max, n_compartments)`` array of expected counts.
+    """
+    n, mean_degree = _population(graph, mean_degree)
+    return np.array([
+        solve_meanfield(model, n, t_max, seeds, mean_degree, method, **params).counts()
+        for params in points
+    ])
@@ -0,0 +1,235 @@
+"""Declarative compartment models compiled to vectorized step functions.
+
+A model is a list of compartments and an ordered list of transitions. The
+transitions run one after another in every step, exactly like the phases of
+the original scripts ("infect susceptible neighbors", "recover infected
+individuals", ...), but each phase is a single batched kernel call.
+
+>>> step = SIR.compile(graph, beta=0.02, gamma=0.05)
+>>> pop = SIR.populate(graph.n, seeds=[0])
+>>> step(pop)
+"""
+
+import numpy as np
+
+from .kernels import as_rng, infect_neighbors, select
+from .state import Compartments, compartment
+
+
+def hazard(p):
+    """Continuous rate at which a transition happens within one step with probability ``p``."""
+    return -np.log1p(-np.minimum(p, 1 - 1e-12))
+
+
+class Contact:
+    """Transition ``src -> dst`` driven by neighbors in ``infectious``.
+
+    ``rate`` names the per-edge transmission parameter and ``mode`` is
+    passed to ``infect_neighbors``.
+    """
+
+    def __init__(self, src, dst, rate, infectious="I", mode="edge"):
+        self.src = compartment(src)
+        self.dst = compartment(dst)
+        self.rate = rate
+        self.infectious = compartment(infectious)
+        self.mode = mode
+
+    def compartments(self):
+        return [self.src, self.dst, self.infectious]
+
+    def parameters(self):
+        return [self.rate]
+
+    def compile(self, graph, params, rng):
+        src, dst, infectious, mode = self.src, self.dst, self.infectious, self.mode
+        beta = params[self.rate]
+
+        def phase(pop):
+            new = infect_neighbors(graph, pop.state, pop[infectious].nodes, beta, rng, src, mode)
+            pop.move(new, src, dst)
+
+        return phase
+
+    def flows(self, params, mean_degree):
+        """Return ``flow(x)``: the mean-field ``(src, dst, rate)`` of this transition.
+
+        ``x`` holds the fraction of nodes in every state code. A susceptible
+        node is assumed to have ``mean_degree * x[infectious]`` infected
+        neighbors, each transmitting as in ``infect_neighbors``.
+        """
+        src, dst, infectious, mode = self.src, self.dst, self.infectious, self.mode
+        beta = params[self.rate]
+
+        def flow(x):
+            if mode == "edge":
+                force = hazard(beta) * mean_degree * x[infectious]
+            elif mode == "prevalence":
+                force = hazard(beta * x[infectious]) * mean_degree * x[infectious]
+            else:
+                force = hazard(beta * x[infectious])
+            return [(src, dst, force * x[src])]
+
+        return flow
+
+
+class Spontaneous:
+    """Transition ``src -> dst`` taken with probability ``rate`` per step.
+
+    With ``branch=(other, prob)`` a node that leaves ``src`` goes to
+    ``other`` with probability ``prob`` and to ``dst`` otherwise, like the
+    recover-or-die step of SEIRD.
+    """
+
+    def __init__(self, src, dst, rate, branch=None):
+        self.src = compartment(src)
+        self.dst = compartment(dst)
+        self.rate = rate
+        self.branch = None if branch is None else (compartment(branch[0]), branch[1])
+
+    def compartments(self):
+        codes = [self.src, self.dst]
+        if self.branch is not None:
+            codes.append(self.branch[0])
+        return codes
+
+    def parameters(self):
+        names = [self.rate]
+        if self.branch is not None:
+            names.append(self.branch[1])
+        return names
+
+    def compile(self, graph, params, rng):
+        src, dst = self.src, self.dst
+        p = params[self.rate]
+
+        if self.branch is None:
+            def phase(pop):
+                pop.move(select(pop[src].nodes, p, rng), src, dst)
+            return phase
+
+        other, q = self.branch[0], params[self.branch[1]]
+
+        def phase(pop):
+            leaving = select(pop[src].nodes, p, rng)
+            pop.move(select(leaving, q, rng), src, other)
+            pop.move(leaving, src, dst)  # nodes already moved to other are skipped
+
+        return phase
+
+    def flows(self, params, mean_degree):
+        """Return ``flow(x)``: the mean-field ``(src, dst, rate)`` of this transition."""
+        src, dst = self.src, self.dst
+        rate = hazard(params[self.rate])
+        if self.branch is None:
+            return lambda x: [(src, dst, rate * x[src])]
+
+        other, q = self.branch[0], params[self.branch[1]]
+        return lambda x: [(src, other, q * rate * x[src]), (src, dst, (1 - q) * rate * x[src])]
+
+
+class Model:
+    """A compartment model: compartments plus ordered transitions."""
+
+    def __init__(self, name, compartments, transitions, initial="S", seed_state="I"):
+        self.name = name
+        self.compartments = [compartment(c) for c in compartments]
+        self.transitions = list(transitions)
+        self.initial = compartment(initial)
+        self.seed_state = compartment(seed_state)
+
+        for transition in self.transitions:
+            for code in transition.compartments():
+                if code not in self.compartments:
+                    raise ValueError(f"{name}: transition uses compartment {code.name} not in the model")
+
+    def __repr__(self):
+        return f"Model({self.name!r})"
+
+    @property
+    def parameters(self):
+        """Names of the parameters ``compile`` expects, in order of first use."""
+        names = []
+        for transition in self.transitions:
+            names += [p for p in transition.parameters() if p not in names]
+        return names
+
+    def populate(self, n, seeds=(0,)):
+        """Return a ``Compartments`` with every node in the initial state except ``seeds``.
+
+        Repeated seeds count once.
+        """
+        pop = Compartments(n, self.compartments, initial=self.initial)
+        pop.move(np.unique(np.asarray(seeds, dtype=np.int64)), self.initial, self.seed_state)
+        return pop
+
+    def check_parameters(self, params):
+        """Raise ``ValueError`` if any parameter of the model is missing from ``params``."""
+        missing = [p for p in self.parameters if p not in params]
+        if missing:
+            raise ValueError(f"{self.name}: missing parameters {', '.join(missing)}")
+
+    def compile(self, graph, rng=None, **params):
+        """Resolve parameters once and return a ``step(pop)`` function.
+
+        ``rng`` is passed through ``as_rng``, so an int seed makes the run
+        reproducible.
+        """
+        rng = as_rng(rng)
+        self.check_parameters(params)
+        phases = [transition.compile(graph, params, rng) for transition in self.transitions]
+
+        def step(pop):
+            for phase in phases:
+                phase(pop)
+
+        return step
+
+
+# Define the eight models of the scripts, with their parameter names
+SI = Model("SI", "SI", [
+    Contact("S", "I", "beta"),  # infect susceptible neighbors
+])
+
+SIS = Model("SIS", "SI", [
+    Contact("S", "I", "beta"),
+    Spontaneous("I", "S", "gamma"),  # infected become susceptible again
+])
+
+SIR = Model("SIR", "SIR", [
+    Contact("S", "I", "beta"),
+    Spontaneous("I", "R", "gamma"),  # recover infected individuals
+])
+
+SIRS = Model("SIRS", "SIR", [
+    Contact("S", "I", "beta"),
+    Spontaneous("I", "R", "gamma"),
+    Spontaneous("R", "S", "eeta"),  # recovered to susceptible
+])
+
+SIRS_V = Model("SIRS-V", "SIRV", [
+    Contact("S", "I", "beta"),
+    Spontaneous("I", "R", "gamma"),
+    Spontaneous("S", "V", "v"),  # vaccinate susceptible individuals
+    Spontaneous("R", "S", "mu"),  # waning immunity
+])
+
+SICR = Model("SICR", "SICR", [
+    Contact("S", "I", "beta"),
+    Spontaneous("I", "C", "gamma"),  # infected become carriers
+    Spontaneous("C", "R", "alpha"),  # carriers recover
+])
+
+SEIR = Model("SEIR", "SEIR", [
+    Contact("S", "E", "beta"),  # expose susceptible neighbors
+    Spontaneous("E", "I", "sigma"),  # latent become infectious
+    Spontaneous("I", "R", "gamma"),
+])
+
+SEIRD = Model("SEIRD", "SEIRD", [
+    Contact("S", "E", "beta", mode="prevalence"),  # exposure probability beta * I / n
+    Spontaneous("E", "I", "alpha"),
+    Spontaneous("I", "R", "gamma", branch=("D", "mu")),  # recover or die
+])
+
+MODELS = {model.name: model for model in (SI, SIS, SIR, SIRS, SIRS_V, SICR, SEIR, SEIRD)}
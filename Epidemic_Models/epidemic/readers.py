@@ -0,0 +1,384 @@
+"""Fast readers that turn edge-list and Matrix Market files into a ``CSRGraph``.
+
+The files are parsed in bulk with NumPy into integer arrays; no networkx
+graph is built on the way. Files ending in ``.gz``, ``.bz2``, ``.xz`` or
+``.zst`` are decompressed on the fly (``.zst`` needs the optional
+``zstandard`` package).
+"""
+
+import bz2
+import gzip
+import io
+import itertools
+import lzma
+import os
+import warnings
+
+import numpy as np
+
+from .graph import CSRGraph
+from .state import index_dtype
+
+COMMENT_PREFIXES = ("#", "%", "//")
+DELIMITERS = (",", "\t", ";", " ")
+
+# Plain edge lists larger than this are read with the chunked two-pass reader
+CHUNKED_BYTES = 256 * 2 ** 20
+
+
+def _open_zstd(path, mode):
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("reading .zst files needs the 'zstandard' package") from None
+    reader = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return io.TextIOWrapper(reader, encoding="utf-8")
+
+
+COMPRESSED_OPENERS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open, ".zst": _open_zstd}
+
+
+def is_compressed(path):
+    return os.path.splitext(path)[1].lower() in COMPRESSED_OPENERS
+
+
+def open_text(path):
+    """Open a possibly compressed file for reading text."""
+    opener = COMPRESSED_OPENERS.get(os.path.splitext(path)[1].lower())
+    if opener is None:
+        return open(path, "r")
+    return opener(path, "rt")
+
+
+def sniff_edgelist(path, sample_bytes=1 << 16):
+    """Guess the delimiter and comment prefixes of an edge-list file.
+
+    Returns ``(delimiter, comments)``; ``delimiter`` is ``None`` for runs of
+    whitespace, as understood by ``np.loadtxt``.
+    """
+    with open_text(path) as f:
+        sample = f.read(sample_bytes).splitlines()
+    if len(sample) > 1:
+        sample = sample[:-1]  # the last line may be cut in the middle
+
+    comments = [prefix for prefix in COMMENT_PREFIXES if any(line.lstrip().startswith(prefix) for line in sample)]
+    data = [line.strip() for line in sample if line.strip() and not line.lstrip().startswith(COMMENT_PREFIXES)]
+
+    delimiter = None
+    for candidate in DELIMITERS[:-1]:
+        if data and all(candidate in line for line in data):
+            delimiter = candidate
+            break
+    return delimiter, comments or ["#"]
+
+
+def detect_index_base(src, dst):
+    """Return 1 if node IDs look 1-based (no 0 but a 1 present), else 0."""
+    if len(src) == 0:
+        return 0
+    return 1 if min(src.min(), dst.min()) == 1 else 0
+
+
+def compact_ids(src, dst):
+    """Number the node IDs appearing in ``src``/``dst`` as ``0 .. n - 1``.
+
+    Works for any integer IDs (sparse, negative, huge) and for string IDs.
+    Returns ``(src_index, dst_index, ids)`` where ``ids`` is sorted and
+    ``ids[k]`` is the original ID of node ``k``.
+    """
+    both = np.concatenate((src, dst))
+    if both.dtype.kind in "iu" and len(both):
+        low, high = both.min(), both.max()
+        if high - low <= 4 * len(both):
+            # Dense enough for a lookup table, which avoids sorting
+            present = np.zeros(high - low + 1, dtype=bool)
+            present[both - low] = True
+            ids = np.flatnonzero(present) + low
+            table = np.cumsum(present) - 1
+            index = table[both - low]
+        else:
+            ids, index = np.unique(both, return_inverse=True)
+    else:
+        ids, index = np.unique(both, return_inverse=True)
+    return index[:len(src)], index[len(src):], ids
+
+
+def read_edges(path, delimiter="auto", comments="auto"):
+    """Read the first two columns of an edge-list file as two arrays.
+
+    Node IDs are parsed as int64 when possible and kept as strings otherwise.
+    """
+    sniffed_delimiter, sniffed_comments = sniff_edgelist(path)
+    if delimiter == "auto":
+        delimiter = sniffed_delimiter
+    if comments == "auto":
+        comments = sniffed_comments
+
+    options = dict(delimiter=delimiter, comments=comments, usecols=(0, 1), ndmin=2)
+    try:
+        with open_text(path) as f:
+            edges = np.loadtxt(f, dtype=np.int64, **options)
+    except ValueError:
+        with open_text(path) as f, warnings.catch_warnings():
+            # loadtxt reads strings in chunks and warns about comment lines
+            warnings.simplefilter("ignore", UserWarning)
+            edges = np.loadtxt(f, dtype=str, **options)
+    return edges[:, 0], edges[:, 1]
+
+
+def read_edgelist(path, delimiter="auto", comments="auto", compact=True, index_base="auto"):
+    """Read an edge-list file straight into a ``CSRGraph``.
+
+    The delimiter (comma, tab, semicolon or whitespace) and comment prefixes
+    are detected from the file unless given. Extra columns (weights,
+    timestamps) are ignored; duplicate edges and self loops are dropped.
+
+    Node IDs of any kind are compacted to ``0 .. n - 1`` and the original
+    IDs kept in ``graph.node_ids``, so 0-based, 1-based, sparse and string
+    IDs all work as they are. With ``compact=False`` integer IDs are used as
+    indices directly after subtracting ``index_base`` (detected as 0 or 1
+    by default), which keeps isolated nodes that never appear in an edge.
+
+    >>> graph = read_edgelist("hamster.edges")     # space separated, 1-based
+    >>> graph = read_edgelist("public_fig.edges")  # comma separated, 0-based
+    """
+    src, dst = read_edges(path, delimiter, comments)
+    if compact:
+        src, dst, ids = compact_ids(src, dst)
+        graph = CSRGraph.from_edges(src, dst, len(ids))
+        if not (ids.dtype.kind in "iu" and len(ids) and ids[0] == 0 and ids[-1] == len(ids) - 1):
+            graph.node_ids = ids
+        return graph
+
+    if src.dtype.kind not in "iu":
+        raise ValueError(f"{path}: compact=False needs integer node IDs")
+    if index_base == "auto":
+        index_base = detect_index_base(src, dst)
+    if index_base:
+        src = src - index_base
+        dst = dst - index_base
+    graph = CSRGraph.from_edges(src, dst)
+    if index_base:
+        graph.node_ids = np.arange(graph.n, dtype=np.int64) + index_base
+    return graph
+
+
+def _read_mtx_header(f):
+    """Parse the banner and size line of an open Matrix Market file."""
+    banner = f.readline().split()
+    if len(banner) < 5 or banner[0].lower() != "%%matrixmarket":
+        raise ValueError("not a Matrix Market file (missing %%MatrixMarket banner)")
+    obj, fmt, field, symmetry = (token.lower() for token in banner[1:5])
+    if obj != "matrix" or fmt != "coordinate":
+        raise ValueError(f"only 'matrix coordinate' Matrix Market files are supported, got '{obj} {fmt}'")
+    if field not in ("pattern", "real", "integer"):
+        raise ValueError(f"unsupported Matrix Market field '{field}'")
+
+    line = f.readline()
+    while line.startswith("%") or not line.strip():
+        if not line:
+            raise ValueError("Matrix Market file has no size line")
+        line = f.readline()
+    rows, cols, nnz = (int(token) for token in line.split()[:3])
+    return field, symmetry, rows, cols, nnz
+
+
+def read_mtx(path, weights=False, chunk_size=1 << 20):
+    """Read a Matrix Market ``coordinate`` file into a ``CSRGraph``.
+
+    The banner decides how entries are read: ``pattern`` files have no
+    values, ``real``/``integer`` values are kept as edge weights when
+    ``weights=True``. ``symmetric`` files store one triangle and ``general``
+    files may store both directions; either way the graph is undirected.
+    Node ``k`` is row/column ``k + 1`` and the declared size is kept, so
+    isolated nodes are preserved. Entries are parsed ``chunk_size`` lines
+    at a time.
+    """
+    with open_text(path) as f:
+        field, symmetry, rows, cols, nnz = _read_mtx_header(f)
+        keep_values = weights and field != "pattern"
+        value_dtype = np.float64 if field == "real" else np.int64
+        usecols = (0, 1, 2) if keep_values else (0, 1)
+
+        src, dst, values = [], [], []
+        remaining = nnz
+        while remaining > 0:
+            lines = itertools.islice(f, min(chunk_size, remaining))
+            block = np.loadtxt(lines, dtype=np.float64 if keep_values else np.int64,
+                               comments="%", usecols=usecols, ndmin=2)
+            if len(block) == 0:
+                raise ValueError(f"{path}: expected {nnz} entries, file ended after {nnz - remaining}")
+            src.append(block[:, 0].astype(np.int64) - 1)
+            dst.append(block[:, 1].astype(np.int64) - 1)
+            if keep_values:
+                values.append(block[:, 2].astype(value_dtype))
+            remaining -= len(block)
+
+    src = np.concatenate(src) if src else np.empty(0, dtype=np.int64)
+    dst = np.concatenate(dst) if dst else np.empty(0, dtype=np.int64)
+    values = np.concatenate(values) if keep_values and values else None
+    return CSRGraph.from_edges(src, dst, max(rows, cols), weights=values)
+
+
+def is_mtx(path):
+    """Return True if ``path`` starts with a Matrix Market banner."""
+    with open_text(path) as f:
+        return f.read(14).lower() == "%%matrixmarket"
+
+
+def iter_edge_chunks(path, delimiter="auto", comments="auto", chunk_size=1 << 20, dtype=np.int64):
+    """Yield ``(src, dst)`` arrays of ``dtype`` for every ``chunk_size`` lines of an edge list."""
+    sniffed_delimiter, sniffed_comments = sniff_edgelist(path)
+    if delimiter == "auto":
+        delimiter = sniffed_delimiter
+    if comments == "auto":
+        comments = sniffed_comments
+
+    with open_text(path) as f, warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        while True:
+            lines = list(itertools.islice(f, chunk_size))
+            if not lines:
+                return
+            block = np.loadtxt(lines, dtype=dtype, delimiter=delimiter, comments=comments,
+                               usecols=(0, 1), ndmin=2)
+            yield block[:, 0], block[:, 1]
+
+
+def _dedupe_rows(indptr, indices, n, block_size):
+    """Sort every row and drop repeated neighbors, compacting ``indices`` in place."""
+    new_degree = np.zeros(n, dtype=np.int64)
+    bounds = np.unique(np.searchsorted(indptr, np.arange(0, indptr[-1], block_size), side="right") - 1)
+    bounds = np.append(bounds[bounds < n], n)
+
+    write = 0
+    for r0, r1 in zip(bounds[:-1], bounds[1:]):
+        a, b = indptr[r0], indptr[r1]
+        rows = np.repeat(np.arange(r1 - r0, dtype=np.int64), np.diff(indptr[r0:r1 + 1]))
+        keys = np.sort(rows * n + indices[a:b])
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = keys[1:] != keys[:-1]
+        keys = keys[first]
+
+        # The write position never passes the read position, so this is safe
+        indices[write:write + len(keys)] = keys % n
+        new_degree[r0:r1] = np.bincount(keys // n, minlength=r1 - r0)
+        write += len(keys)
+
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(new_degree, out=indptr[1:])
+    return indptr, indices[:write].copy()
+
+
+def _merge_degrees(ids, degree):
+    """Sum the ``degree`` entries of equal ``ids``; returns sorted unique IDs and their sums."""
+    order = np.argsort(ids, kind="stable")
+    ids, degree = ids[order], degree[order]
+    first = np.ones(len(ids), dtype=bool)
+    first[1:] = ids[1:] != ids[:-1]
+    starts = np.flatnonzero(first)
+    return ids[starts], np.add.reduceat(degree, starts) if len(ids) else degree
+
+
+def _count_degrees(chunks):
+    """Pass 1 of the chunked reader: sorted node IDs and the degree of each.
+
+    Every chunk is reduced to its own unique IDs, and those partial results
+    are merged whenever they outgrow the IDs found so far, so memory follows
+    the number of distinct IDs, not their values.
+    """
+    ids, degree = None, np.zeros(0, dtype=np.int64)
+    pending_ids, pending_degree, pending = [], [], 0
+    for src, dst in chunks:
+        if ids is None:
+            ids = np.empty(0, dtype=src.dtype)
+        keep = (src != dst).astype(np.int64)  # self loops add a node but no degree
+        chunk_ids, chunk_degree = _merge_degrees(np.concatenate((src, dst)), np.concatenate((keep, keep)))
+        pending_ids.append(chunk_ids)
+        pending_degree.append(chunk_degree)
+        pending += len(chunk_ids)
+        if pending > len(ids):
+            ids, degree = _merge_degrees(np.concatenate([ids] + pending_ids), np.concatenate([degree] + pending_degree))
+            pending_ids, pending_degree, pending = [], [], 0
+    if ids is None:
+        return np.empty(0, dtype=np.int64), degree
+    if pending:
+        ids, degree = _merge_degrees(np.concatenate([ids] + pending_ids), np.concatenate([degree] + pending_degree))
+    return ids, degree
+
+
+def read_edgelist_chunked(path, delimiter="auto", comments="auto", compact=True, index_base="auto",
+                          chunk_size=1 << 20):
+    """Read a large (possibly compressed) edge list with bounded extra memory.
+
+    Takes the same options as ``read_edgelist`` and gives the same graph.
+    The file is streamed ``chunk_size`` lines at a time, twice: the first
+    pass collects the distinct node IDs and their degrees, which sizes
+    ``indptr``; the second writes each edge straight into its slot of
+    ``indices``. Duplicate edges are then removed row block by row block,
+    so peak memory stays close to the final CSR plus one chunk. Integer IDs
+    are parsed as int64; a file with any other ID is read with string IDs.
+    """
+    dtype = np.int64
+    try:
+        ids, degree = _count_degrees(iter_edge_chunks(path, delimiter, comments, chunk_size, dtype))
+    except ValueError:
+        dtype = str
+        ids, degree = _count_degrees(iter_edge_chunks(path, delimiter, comments, chunk_size, dtype))
+
+    if compact:
+        n = len(ids)
+        node_of = lambda raw: np.searchsorted(ids, raw)
+    else:
+        if dtype is str:
+            raise ValueError(f"{path}: compact=False needs integer node IDs")
+        if index_base == "auto":
+            index_base = 1 if len(ids) and ids[0] == 1 else 0
+        if len(ids) and ids[0] < index_base:
+            raise ValueError(f"{path}: node ID {ids[0]} is below index_base {index_base}")
+        n = int(ids[-1]) - index_base + 1 if len(ids) else 0
+        full = np.zeros(n, dtype=np.int64)
+        full[ids - index_base] = degree
+        degree = full
+        node_of = lambda raw: raw - index_base
+
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(degree, out=indptr[1:])
+    indices = np.empty(indptr[-1], dtype=index_dtype(n))
+    cursor = indptr[:-1].copy()
+
+    # Pass 2: write every edge, in both directions, into its row
+    for src, dst in iter_edge_chunks(path, delimiter, comments, chunk_size, dtype):
+        keep = src != dst
+        src, dst = node_of(src[keep]), node_of(dst[keep])
+        rows = np.concatenate((src, dst)).astype(np.int64)
+        cols = np.concatenate((dst, src))
+        order = np.argsort(rows, kind="stable")
+        rows, cols = rows[order], cols[order]
+        present, start, count = np.unique(rows, return_index=True, return_counts=True)
+        rank = np.arange(len(rows)) - np.repeat(start, count)
+        indices[cursor[rows] + rank] = cols
+        cursor[present] += count
+
+    indptr, indices = _dedupe_rows(indptr, indices, n, chunk_size)
+    graph = CSRGraph(indptr, indices)
+    if compact and not (ids.dtype.kind in "iu" and len(ids) and ids[0] == 0 and ids[-1] == len(ids) - 1):
+        graph.node_ids = ids
+    elif not compact and index_base:
+        graph.node_ids = np.arange(n, dtype=np.int64) + index_base
+    return graph
+
+
+def read_graph(path, **options):
+    """Read ``path`` with the reader that fits its format and size.
+
+    Matrix Market files are recognized by their banner, whatever their
+    extension (the real-world scripts read ``texas.mtx``). Compressed edge
+    lists and plain ones larger than ``CHUNKED_BYTES`` use
+    ``read_edgelist_chunked``; others use ``read_edgelist``.
+    """
+    if is_mtx(path):
+        return read_mtx(path, **options)
+    if is_compressed(path) or os.path.getsize(path) > CHUNKED_BYTES:
+        return read_edgelist_chunked(path, **options)
+    return read_edgelist(path, **options)
@@ -0,0 +1,199 @@
+"""Trajectory recorders that observe the transitions of a ``Compartments``."""
+
+import numpy as np
+
+from .state import compartment, index_dtype
+
+# Per-node histories larger than this are not kept by choose_recorder
+DEFAULT_HISTORY_BUDGET = 512 * 2 ** 20
+
+
+class EventRecorder:
+    """Store a trajectory as a log of state transitions.
+
+    Instead of dense ``(n, t_max)`` history matrices, only the initial state
+    vector and one ``(node, from_state, to_state)`` event per transition are
+    kept, plus a time index: the events of step ``t`` are
+    ``events[offsets[t - 1]:offsets[t]]``. Memory is O(n + transitions), and
+    the state at any step or the per-step compartment counts are rebuilt on
+    demand.
+
+    >>> rec = EventRecorder(pop)
+    >>> for t in range(1, t_max):
+    ...     ...  # pop.move(...) calls are logged automatically
+    ...     rec.end_step()
+    >>> plt.plot(rec.count("I"))
+    """
+
+    def __init__(self, pop):
+        self.codes = list(pop.codes)
+        self.initial = pop.snapshot()
+        self._nodes, self._src, self._dst = [], [], []
+        self._node_dtype = index_dtype(pop.n)
+        self._total = 0
+        self.offsets = [0]
+        pop.recorders.append(self)
+
+    @property
+    def steps(self):
+        """Number of completed steps, including the initial state (step 0)."""
+        return len(self.offsets)
+
+    def record(self, nodes, src, dst):
+        if len(nodes) == 0:
+            return
+        self._nodes.append(np.asarray(nodes, dtype=self._node_dtype))
+        self._src.append(np.full(len(nodes), src, dtype=np.uint8))
+        self._dst.append(np.full(len(nodes), dst, dtype=np.uint8))
+        self._total += len(nodes)
+
+    def end_step(self):
+        """Close the current step; later transitions belong to the next one."""
+        self.offsets.append(self._total)
+
+    def events(self):
+        """Return the event log as ``(step, node, from_state, to_state)`` arrays.
+
+        Only completed steps are included.
+        """
+        self._consolidate()
+        end = self.offsets[-1]
+        per_step = np.diff(self.offsets, prepend=0)
+        step = np.repeat(np.arange(self.steps, dtype=np.int32), per_step)
+        return step, self._nodes[0][:end], self._src[0][:end], self._dst[0][:end]
+
+    def state_at(self, t):
+        """Reconstruct the ``uint8`` state vector at the end of step ``t``."""
+        if not 0 <= t < self.steps:
+            raise IndexError(f"step {t} out of range [0, {self.steps})")
+        self._consolidate()
+        end = self.offsets[t]
+        state = self.initial.copy()
+
+        # Apply only the last transition of every node up to step t
+        nodes = self._nodes[0][:end][::-1]
+        nodes, last = np.unique(nodes, return_index=True)
+        state[nodes] = self._dst[0][:end][::-1][last]
+        return state
+
+    def transitions(self, steps=None, start=0):
+        """Yield ``(t, nodes, from_state, to_state)`` for every step ``t`` in ``steps``.
+
+        Each item holds the events since the previous step yielded (since
+        step ``start``, by default the initial state, for the first one), so
+        applying them in order to per-compartment tallies keeps those
+        tallies at step ``t``. ``steps`` must be increasing and not before
+        ``start`` (all steps by default). The arrays are views of the log.
+        """
+        self._consolidate()
+        nodes, src, dst = self._nodes[0], self._src[0], self._dst[0]
+        done = self.offsets[start]
+        for t in range(start, self.steps) if steps is None else steps:
+            if not 0 <= t < self.steps:
+                raise IndexError(f"step {t} out of range [0, {self.steps})")
+            end = self.offsets[t]
+            if end < done:
+                raise ValueError("replay steps must be increasing")
+            yield t, nodes[done:end], src[done:end], dst[done:end]
+            done = end
+
+    def replay(self, steps=None, state=None, start=0):
+        """Yield ``(t, state)`` for every step ``t`` in ``steps``, in order.
+
+        ``steps`` must be increasing (all steps by default), e.g.
+        ``range(0, rec.steps, 5)``. The state vector is rolled forward by
+        the events in between, so a whole replay costs O(n + events) rather
+        than one ``state_at`` per frame. Passing the ``state`` at step
+        ``start`` resumes from there instead of the initial state. The same
+        array is updated in place and yielded every time; copy it to keep a
+        frame.
+        """
+        state = self.initial.copy() if state is None else np.array(state, dtype=np.uint8)
+        for t, nodes, _, dst in self.transitions(steps, start):
+            # A node may move more than once in between; its last move wins
+            moved, last = np.unique(nodes[::-1], return_index=True)
+            state[moved] = dst[::-1][last]
+            yield t, state
+
+    def counts(self):
+        """Return a ``(steps, n_compartments)`` array of compartment sizes."""
+        step, _, src, dst = self.events()
+        k = max(self.codes) + 1
+        size = self.steps * k
+        delta = np.bincount(step * k + dst, minlength=size) - np.bincount(step * k + src, minlength=size)
+        delta = delta.reshape(self.steps, k)
+        delta[0] += np.bincount(self.initial, minlength=k)[:k]
+        return np.cumsum(delta, axis=0)[:, self.codes]
+
+    def count(self, name):
+        """Return the size of one compartment at every step."""
+        return self.counts()[:, self.codes.index(compartment(name))]
+
+    def _consolidate(self):
+        if len(self._nodes) != 1:
+            self._nodes = [np.concatenate([np.empty(0, self._node_dtype)] + self._nodes)]
+            self._src = [np.concatenate([np.empty(0, np.uint8)] + self._src)]
+            self._dst = [np.concatenate([np.empty(0, np.uint8)] + self._dst)]
+
+
+class CountsRecorder:
+    """Record only the per-step size of every compartment.
+
+    Running totals are updated on every transition, so each step costs
+    O(n_compartments) and the whole trajectory is a single
+    ``(t_max, n_compartments)`` integer array. Use this when only the
+    S/I/R curves are needed.
+
+    >>> rec = CountsRecorder(pop, t_max)
+    >>> for t in range(1, t_max):
+    ...     ...
+    ...     rec.end_step()
+    >>> plt.plot(rec.count("I"))
+    """
+
+    def __init__(self, pop, t_max):
+        self.codes = list(pop.codes)
+        self._column = {code: i for i, code in enumerate(self.codes)}
+        self.current = pop.counts()
+        self._counts = np.zeros((max(t_max, 1), len(self.codes)), dtype=np.int64)
+        self._counts[0] = self.current
+        self.steps = 1
+        pop.recorders.append(self)
+
+    def record(self, nodes, src, dst):
+        self.current[self._column[src]] -= len(nodes)
+        self.current[self._column[dst]] += len(nodes)
+
+    def end_step(self):
+        """Close the current step and store the running totals."""
+        if self.steps == len(self._counts):
+            self._counts = np.concatenate((self._counts, np.zeros_like(self._counts)))
+        self._counts[self.steps] = self.current
+        self.steps += 1
+
+    def counts(self):
+        """Return a ``(steps, n_compartments)`` array of compartment sizes."""
+        return self._counts[:self.steps]
+
+    def count(self, name):
+        """Return the size of one compartment at every step."""
+        return self.counts()[:, self._column[compartment(name)]]
+
+
+def estimate_history_bytes(n, t_max, transitions_per_node=4):
+    """Estimate the memory an ``EventRecorder`` needs for a run.
+
+    The log holds the initial state (one byte per node) and about
+    ``transitions_per_node`` events per node, each a node index plus two
+    state bytes. Models with reinfection (SIS, SIRS) cycle more often and
+    should pass a larger value.
+    """
+    event_bytes = np.dtype(index_dtype(n)).itemsize + 2
+    return n + int(n * transitions_per_node * event_bytes) + 8 * t_max
+
+
+def choose_recorder(pop, t_max, budget=DEFAULT_HISTORY_BUDGET, transitions_per_node=4):
+    """Return an ``EventRecorder`` if it fits in ``budget`` bytes, else a ``CountsRecorder``."""
+    if estimate_history_bytes(pop.n, t_max, transitions_per_node) <= budget:
+        return EventRecorder(pop)
+    return CountsRecorder(pop, t_max)
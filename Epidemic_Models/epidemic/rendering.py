@@ -0,0 +1,130 @@
+"""Animation of node states on a drawn graph.
+
+Simulation and drawing are separate: a model is first run to the end with
+an ``EventRecorder`` (at full speed, no figure needed), and
+``GraphRenderer.replay`` then plays back any stretch of the stored
+trajectory at any frame stride.
+
+``GraphRenderer`` draws the graph once: all edges as a single
+``LineCollection`` and all nodes as a single scatter collection. A frame
+then only recolors the nodes from the state vector and rewrites the status
+text, so frames cost O(n) array work instead of rebuilding every artist as
+``plt.clf()`` followed by ``nx.draw`` does, and ``FuncAnimation`` can blit.
+
+matplotlib is imported when a renderer is created, so the simulation engine
+does not need it.
+"""
+
+import numpy as np
+
+from .state import compartment
+
+# Colors and labels the model scripts use for each compartment
+COLORS = {"S": "blue", "E": "orange", "I": "red", "C": "orange", "R": "green", "V": "pink", "D": "black"}
+LABELS = {
+    "S": "Susceptible",
+    "E": "Exposed",
+    "I": "Infected",
+    "C": "Carrier",
+    "R": "Recovered",
+    "V": "Vaccinated",
+    "D": "Dead",
+}
+
+
+def replay_steps(recorder, stride=1, window=None):
+    """Steps of a stored run to draw: every ``stride``-th one, within ``window=(start, stop)``."""
+    start, stop = (0, recorder.steps) if window is None else window
+    return range(start, min(stop, recorder.steps), stride)
+
+
+def status_text(names, counts, t=None, t_max=None):
+    """Return the ``Time Step`` and per-compartment node count lines shown on a frame."""
+    lines = [] if t is None else [f"Time Step: {t}" + ("" if t_max is None else f"/{t_max}")]
+    lines += [f"{LABELS[name]} Nodes: {count}" for name, count in zip(names, counts)]
+    return "\n".join(lines)
+
+
+def edge_segments(graph, pos):
+    """Return the ``(edges, 2, 2)`` line segments of every undirected edge."""
+    rows = np.repeat(np.arange(graph.n), graph.degree())
+    cols = np.asarray(graph.indices)
+    upper = rows < cols
+    return np.stack((pos[rows[upper]], pos[cols[upper]]), axis=1)
+
+
+class GraphRenderer:
+    """Draws a graph once and recolors its nodes on every frame.
+
+    ``names`` are the compartments to report in the status text, in order
+    (e.g. ``model.compartments``); ``colors`` overrides entries of
+    ``COLORS``. ``t_max`` is shown as ``Time Step: t/t_max``.
+    """
+
+    def __init__(self, graph, pos, names, ax=None, title=None, t_max=None, colors=None, node_size=300,
+                 edge_color="k", edge_width=1.0):
+        from matplotlib.collections import LineCollection
+        from matplotlib.colors import to_rgba_array
+
+        if ax is None:
+            import matplotlib.pyplot as plt
+
+            ax = plt.gca()
+        self.ax = ax
+        self.names = [compartment(name).name for name in names]
+        self.codes = [int(compartment(name)) for name in names]
+        self.t_max = t_max
+
+        # Lookup table from state code to RGBA, so a frame is one fancy index
+        colors = {**COLORS, **(colors or {})}
+        self.palette = np.zeros((max(self.codes) + 1, 4))
+        self.palette[self.codes] = to_rgba_array([colors[name] for name in self.names])
+
+        pos = np.asarray(pos, dtype=float)
+        self.edges = LineCollection(edge_segments(graph, pos), colors=edge_color, linewidths=edge_width, zorder=1)
+        self.ax.add_collection(self.edges)
+        # Markers without outlines draw about twice as fast
+        self.nodes = self.ax.scatter(pos[:, 0], pos[:, 1], s=node_size, linewidths=0, zorder=2)
+        self.text = self.ax.text(0.01, 0.99, "", transform=self.ax.transAxes, va="top", zorder=3)
+        if title is not None:
+            self.ax.set_title(title)
+        self.ax.set_axis_off()
+
+    @property
+    def artists(self):
+        """The artists a frame changes, for ``FuncAnimation(blit=True)``."""
+        return self.nodes, self.text
+
+    def draw(self, state, t=None):
+        """Show the ``uint8`` state vector ``state`` at time step ``t``."""
+        self.nodes.set_facecolor(self.palette[state])
+        counts = np.bincount(state, minlength=len(self.palette))
+        self.text.set_text(status_text(self.names, counts[self.codes], t, self.t_max))
+        return self.artists
+
+    def replay(self, recorder, stride=1, window=None, interval=50, blit=True, **kwargs):
+        """Return a ``FuncAnimation`` replaying the trajectory stored in an ``EventRecorder``.
+
+        Every ``stride``-th step is drawn; ``window=(start, stop)`` limits
+        the replay to those steps. Frames are produced on demand, so no
+        states are kept beyond the one being drawn.
+        """
+        from matplotlib.animation import FuncAnimation
+
+        steps = replay_steps(recorder, stride, window)
+        return FuncAnimation(self.ax.figure, lambda frame: self.draw(frame[1], frame[0]),
+                             frames=lambda: recorder.replay(steps), init_func=lambda: self.artists,
+                             save_count=len(steps), cache_frame_data=False, interval=interval, blit=blit,
+                             **kwargs)
+
+    def animate(self, states, frames, interval=50, blit=True, **kwargs):
+        """Return a ``FuncAnimation`` showing ``states(t)`` for every ``t`` in ``frames``.
+
+        ``states`` maps a time step to a state vector, e.g. a live
+        ``Compartments`` that is stepped between frames or a recorded
+        trajectory's ``state_at``.
+        """
+        from matplotlib.animation import FuncAnimation
+
+        return FuncAnimation(self.ax.figure, lambda t: self.draw(states(t), t), frames=frames,
+                             init_func=lambda: self.artists, interval=interval, blit=blit, **kwargs)
@@ -0,0 +1,70 @@
+"""Place a ``CSRGraph`` in shared memory so worker processes attach to it.
+
+The owner copies the CSR arrays into ``multiprocessing.shared_memory``
+blocks once; workers receive only the small, picklable ``handle`` and map
+the same pages zero-copy instead of unpickling their own graph.
+
+>>> with SharedGraph(graph) as shared:
+...     pool = ProcessPoolExecutor(initializer=init, initargs=(shared.handle,))
+...     # in the worker: graph = attach_graph(handle)
+"""
+
+import sys
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .graph import CSRGraph
+
+
+def _attach_block(name):
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Pool workers share the owner's resource tracker, for which registering
+    # the same block again is a no-op
+    return shared_memory.SharedMemory(name=name)
+
+
+class SharedGraph:
+    """Owner of the shared-memory copy of a graph; use as a context manager."""
+
+    def __init__(self, graph):
+        self._blocks = []
+        handle = {"n": graph.n}
+        for key in ("indptr", "indices", "weights"):
+            array = getattr(graph, key)
+            if array is None:
+                continue
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, array.dtype, buffer=shm.buf)[:] = array
+            self._blocks.append(shm)
+            handle[key] = (shm.name, array.shape, array.dtype.str)
+        self.handle = handle
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Release and remove the shared blocks (after all workers are done)."""
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+
+def attach_graph(handle):
+    """Return a ``CSRGraph`` backed by the shared blocks described by ``handle``."""
+    arrays, blocks = {"weights": None}, []
+    for key in ("indptr", "indices", "weights"):
+        if key not in handle:
+            continue
+        name, shape, dtype = handle[key]
+        shm = _attach_block(name)
+        blocks.append(shm)
+        arrays[key] = np.ndarray(shape, np.dtype(dtype), buffer=shm.buf)
+    graph = CSRGraph(arrays["indptr"], arrays["indices"], weights=arrays["weights"])
+    graph._shared_blocks = blocks  # keep the mappings alive with the graph
+    return graph
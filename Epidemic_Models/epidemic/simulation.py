@@ -0,0 +1,29 @@
+"""Run a compiled model for a fixed number of steps."""
+
+from .recording import CountsRecorder, EventRecorder, choose_recorder
+
+
+def simulate(model, graph, t_max, seeds=(0,), record="counts", rng=None, **params):
+    """Simulate ``model`` on ``graph`` and return the recorder.
+
+    ``record`` is ``"counts"`` (per-step compartment totals), ``"events"``
+    (full transition log) or ``"auto"`` (events if they fit in the memory
+    budget of ``choose_recorder``). Step 0 is the initial state, so the
+    recorder holds ``t_max`` steps like the scripts' history arrays.
+    """
+    step = model.compile(graph, rng=rng, **params)
+    pop = model.populate(graph.n, seeds)
+
+    if record == "counts":
+        rec = CountsRecorder(pop, t_max)
+    elif record == "events":
+        rec = EventRecorder(pop)
+    elif record == "auto":
+        rec = choose_recorder(pop, t_max)
+    else:
+        raise ValueError(f"unknown record mode {record!r}")
+
+    for t in range(1, t_max):
+        step(pop)
+        rec.end_step()
+    return rec
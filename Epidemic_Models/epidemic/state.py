@@ -0,0 +1,132 @@
+"""Compact node state shared by all compartment models."""
+
+from enum import IntEnum
+
+import numpy as np
+
+
+class Compartment(IntEnum):
+    """State codes stored in the ``uint8`` state vector.
+
+    One enum covers every model family (SI, SIS, SIR, SIRS, SIRS-V, SICR,
+    SEIR, SEIRD); a model simply uses the subset of codes it needs.
+    """
+
+    S = 0  # susceptible
+    E = 1  # exposed
+    I = 2  # infected
+    C = 3  # carrier
+    R = 4  # recovered
+    V = 5  # vaccinated
+    D = 6  # dead
+
+
+def compartment(name):
+    """Return the ``Compartment`` for an enum member, code or letter."""
+    if isinstance(name, str):
+        return Compartment[name]
+    return Compartment(name)
+
+
+def index_dtype(n):
+    """Smallest integer dtype able to hold node indices ``0 .. n - 1``."""
+    return np.int32 if n < 2 ** 31 else np.int64
+
+
+class ActiveSet:
+    """Members of one compartment as a compact index array.
+
+    Membership itself lives in the shared state vector (``state[j] == code``),
+    so a phase that only touches this compartment costs O(len(set)) instead
+    of O(n). Nodes that have left the compartment are dropped from the index
+    array lazily, once stale entries make up half of it, which keeps moves
+    proportional to the batch size.
+    """
+
+    def __init__(self, state, code):
+        self.state = state
+        self.code = code
+        self._nodes = np.empty(0, dtype=index_dtype(len(state)))
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, node):
+        return self.state[node] == self.code
+
+    @property
+    def nodes(self):
+        """Indices of the current members (unordered)."""
+        if len(self._nodes) != self._count:
+            self._compact()
+        return self._nodes
+
+    @property
+    def mask(self):
+        """Boolean membership mask of length n, derived from the state vector."""
+        return self.state == self.code
+
+    def _added(self, nodes):
+        self._count += len(nodes)
+        self._nodes = np.concatenate((self._nodes, nodes.astype(self._nodes.dtype)))
+
+    def _removed(self, count):
+        self._count -= count
+        if len(self._nodes) > 2 * self._count + 64:
+            self._compact()
+
+    def _compact(self):
+        nodes = self._nodes[self.state[self._nodes] == self.code]
+        # A node that left and came back before compaction appears twice
+        if len(nodes) != self._count:
+            nodes = np.unique(nodes)
+        self._nodes = nodes
+
+
+class Compartments:
+    """Node states of one simulation as a single ``uint8`` vector.
+
+    ``state[j]`` holds the ``Compartment`` code of node ``j``; every
+    compartment also keeps an ``ActiveSet`` of its members so phases only
+    touch the nodes they act on. Compartments can be named by letter or by
+    enum member:
+
+    >>> pop = Compartments(n, ["S", "I", "R"], initial="S")
+    >>> pop.move([0], "S", "I")
+    >>> pop.move(recovered, "I", "R")
+    """
+
+    def __init__(self, n, names, initial):
+        self.n = n
+        self.codes = [compartment(name) for name in names]
+        self.state = np.full(n, compartment(initial), dtype=np.uint8)
+        self.sets = {code: ActiveSet(self.state, code) for code in self.codes}
+        self.sets[compartment(initial)]._added(np.arange(n))
+        self.recorders = []
+
+    def __getitem__(self, name):
+        return self.sets[compartment(name)]
+
+    def move(self, nodes, src, dst):
+        """Move distinct ``nodes`` from ``src`` to ``dst``; non-members of ``src`` are skipped."""
+        src, dst = compartment(src), compartment(dst)
+        nodes = np.asarray(nodes, dtype=np.int64)
+        nodes = nodes[self.state[nodes] == src]
+        self.state[nodes] = dst
+        self.sets[src]._removed(len(nodes))
+        self.sets[dst]._added(nodes)
+        for recorder in self.recorders:
+            recorder.record(nodes, src, dst)
+
+    def mask(self, name):
+        """Boolean membership mask of one compartment."""
+        return self.state == compartment(name)
+
+    def counts(self):
+        """Return the number of nodes in each compartment, in ``codes`` order."""
+        return np.array([len(self.sets[code]) for code in self.codes])
+
+    def snapshot(self):
+        """Return a copy of the state vector (n bytes)."""
+        return self.state.copy()
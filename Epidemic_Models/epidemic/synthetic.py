@@ -0,0 +1,132 @@
+"""Reproducible, cached ensembles of generated graphs.
+
+A synthetic graph is fully determined by its generator, parameters and
+seed, so it is generated once, written to ``cache_dir`` in the binary CSR
+format and read back by every later run. Comparing models on the same
+ensemble of graphs then costs one generation per graph, not one per model.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .cache import CACHE_SUFFIX, load_saved_graph, save_graph
+from .generators import GENERATORS
+from .mapped import MAPPED_SUFFIX, open_mapped_graph, save_mapped_graph
+
+DEFAULT_GRAPH_DIR = "graph_cache"
+
+# Bump when a generator changes which graph a seed produces
+GENERATOR_VERSION = 1
+
+
+def generator_name(generator):
+    """Return the ``GENERATORS`` key of a generator given by name or function."""
+    for name, function in GENERATORS.items():
+        if generator in (name, function):
+            return name
+    raise ValueError(f"unknown graph generator {generator!r}")
+
+
+def graph_path(generator, params, seed, cache_dir=DEFAULT_GRAPH_DIR, mmap=False):
+    """Where the graph for ``(generator, params, seed)`` is cached.
+
+    The file name spells out the key, e.g.
+    ``barabasi_albert-m5-n100-seed7.csr.npz``.
+    """
+    parts = [generator_name(generator)]
+    parts += [f"{key}{params[key]}" for key in sorted(params)]
+    parts.append(f"seed{seed}")
+    return os.path.join(cache_dir, "-".join(parts) + (MAPPED_SUFFIX if mmap else CACHE_SUFFIX))
+
+
+def _plain(value):
+    """``value`` as a Python scalar if it is a numpy one, so it can be written as JSON."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _plain_params(params):
+    return {key: _plain(value) for key, value in params.items()}
+
+
+def _graph_meta(generator, params, seed):
+    return {"generator": generator, "params": params, "seed": seed, "generator_version": GENERATOR_VERSION}
+
+
+def _load_cached(target, meta, mmap):
+    """Return the graph at ``target`` if it was made from ``meta``, else ``None``."""
+    if not os.path.exists(target):
+        return None
+    try:
+        graph, saved = (open_mapped_graph if mmap else load_saved_graph)(target)
+    except (OSError, ValueError, KeyError):
+        return None
+    return graph if saved == meta else None
+
+
+def generate_graph(generator, seed, cache_dir=DEFAULT_GRAPH_DIR, mmap=False, **params):
+    """Return the graph ``generator(**params, seed=seed)``, cached on disk.
+
+    ``generator`` is a ``GENERATORS`` name or function, e.g.
+    ``generate_graph("barabasi_albert", seed=7, n=10**6, m=5)``. With
+    ``seed=None`` the graph is not reproducible, so it is not cached.
+    """
+    name = generator_name(generator)
+    if seed is None:
+        return GENERATORS[name](seed=None, **params)
+
+    # numpy scalars are keyed like the Python ones, e.g. n=np.int64(100) as n=100
+    params, seed = _plain_params(params), _plain(seed)
+
+    meta = _graph_meta(name, params, seed)
+    target = graph_path(name, params, seed, cache_dir, mmap)
+    graph = _load_cached(target, meta, mmap)
+    if graph is not None:
+        return graph
+
+    graph = GENERATORS[name](seed=seed, **params)
+    os.makedirs(cache_dir, exist_ok=True)
+    (save_mapped_graph if mmap else save_graph)(graph, target, meta)
+    if mmap:
+        return open_mapped_graph(target)[0]
+    graph.path = target
+    return graph
+
+
+def _generate_task(task):
+    generator, params, seed, cache_dir, mmap = task
+    generate_graph(generator, seed, cache_dir, mmap, **params)
+
+
+def graph_ensemble(generator, count, seed=0, cache_dir=DEFAULT_GRAPH_DIR, mmap=False, workers=None, **params):
+    """Return ``count`` realizations of a generated graph.
+
+    Graph ``i`` uses seed ``seed + i``, so ensembles with the same
+    generator, parameters and seeds share their cached graphs. Graphs not
+    in the cache yet are generated in parallel over ``workers`` processes
+    (all cores by default; ``workers=1`` generates them in this process).
+    With ``mmap=True`` the graphs are memory-mapped, so a large ensemble
+    does not have to fit in memory at once.
+    """
+    name = generator_name(generator)
+    params, seed, count = _plain_params(params), _plain(seed), _plain(count)
+    seeds = range(seed, seed + count)
+    graphs = [
+        _load_cached(graph_path(name, params, s, cache_dir, mmap), _graph_meta(name, params, s), mmap)
+        for s in seeds
+    ]
+    missing = [(name, params, s, cache_dir, mmap) for s, graph in zip(seeds, graphs) if graph is None]
+
+    if workers == 1 or len(missing) <= 1:
+        for task in missing:
+            _generate_task(task)
+    else:
+        os.makedirs(cache_dir, exist_ok=True)
+        with ProcessPoolExecutor(workers) as pool:
+            list(pool.map(_generate_task, missing))
+
+    return [
+        generate_graph(name, s, cache_dir, mmap, **params) if graph is None else graph
+        for s, graph in zip(seeds, graphs)
+    ]
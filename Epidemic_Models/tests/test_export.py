@@ -0,0 +1,39 @@
+import os
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+import pytest
+
+from epidemic import SIR, DensityRenderer, GraphRenderer, export_animation, generate_graph, graph_layout, simulate
+
+
+@pytest.fixture(scope="module")
+def run():
+    graph = generate_graph("watts_strogatz", None, n=200, k=4, p=0.1)
+    rec = simulate(SIR, graph, 40, seeds=[0, 1], record="events", rng=0, beta=0.3, gamma=0.1)
+    return rec, graph, graph_layout(graph, "spiral")
+
+
+def read_frames(directory):
+    return [open(os.path.join(directory, name), "rb").read() for name in sorted(os.listdir(directory))]
+
+
+@pytest.mark.parametrize("renderer", [GraphRenderer, DensityRenderer])
+def test_parallel_frames_match_serial(tmp_path, run, renderer):
+    rec, graph, pos = run
+    for workers in (1, 2):
+        count = export_animation(rec, str(tmp_path / f"{workers}" / "{:04d}.png"), graph, pos, ["S", "I", "R"],
+                                 stride=3, window=(5, 38), workers=workers, chunk=2, renderer=renderer,
+                                 figsize=(2, 2), dpi=50)
+        assert count == 11
+    assert read_frames(tmp_path / "1") == read_frames(tmp_path / "2")
+
+
+def test_replay_resumes_from_state(run):
+    rec = run[0]
+    state = rec.state_at(10)
+    for t, resumed in rec.replay(range(12, 40, 4), state, start=10):
+        assert np.array_equal(resumed, rec.state_at(t))
@@ -0,0 +1,27 @@
+import numpy as np
+
+from epidemic import SIR, SEIRD, generate_graph, simulate, solve_meanfield
+
+
+def test_counts_keep_population():
+    rec = solve_meanfield(SEIRD, 1000, 50, mean_degree=4, beta=0.5, alpha=0.2, gamma=0.1, mu=0.05)
+    assert rec.counts().shape == (50, 5)
+    assert np.allclose(rec.counts().sum(axis=1), 1000)
+
+
+def test_single_step_is_initial_state():
+    graph = generate_graph("watts_strogatz", None, n=50, k=4, p=0.1)
+    expected = simulate(SIR, graph, 1, seeds=[0], beta=0.1, gamma=0.1).counts()
+    rec = solve_meanfield(SIR, graph, 1, seeds=[0], beta=0.1, gamma=0.1)
+    assert rec.steps == 1
+    assert np.array_equal(rec.counts(), expected)
+
+
+def test_no_steps():
+    rec = solve_meanfield(SIR, 100, 0, mean_degree=4, beta=0.1, gamma=0.1)
+    assert rec.counts().shape == (0, 3)
+
+
+def test_repeated_seeds_count_once():
+    rec = solve_meanfield(SIR, 100, 3, seeds=[0, 0], mean_degree=4, beta=0.1, gamma=0.1)
+    assert np.array_equal(rec.counts()[0], [99, 1, 0])
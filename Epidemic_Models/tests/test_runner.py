@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from epidemic import SIR, generate_graph, run_sweep
+
+
+@pytest.fixture(scope="module")
+def graph():
+    return generate_graph("watts_strogatz", None, n=50, k=4, p=0.1)
+
+
+def test_sweep_shapes(graph):
+    points = [{"beta": beta, "gamma": 0.1} for beta in (0.1, 0.3)]
+    results = run_sweep(SIR, graph, 10, points, replicates=5, seed=1, workers=1, batch=2)
+    assert [counts.shape for counts in results] == [(10, 5, 3), (10, 5, 3)]
+    assert np.all(results[0].sum(axis=2) == 50)
+
+
+@pytest.mark.parametrize("options, argument", [({"replicates": 0}, "replicates"), ({"seeds": []}, "seeds")])
+def test_sweep_rejects_empty_runs(graph, options, argument):
+    with pytest.raises(ValueError, match=argument):
+        run_sweep(SIR, graph, 10, [{"beta": 0.1, "gamma": 0.1}], workers=1, **options)
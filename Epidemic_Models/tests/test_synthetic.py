@@ -0,0 +1,15 @@
+import numpy as np
+
+from epidemic import generate_graph, graph_ensemble
+
+
+def test_numpy_params_share_cache(tmp_path):
+    graph = generate_graph("barabasi_albert", np.int64(3), cache_dir=str(tmp_path), n=np.int64(100), m=2)
+    assert graph.path == generate_graph("barabasi_albert", 3, cache_dir=str(tmp_path), n=100, m=2).path
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_ensemble_numpy_params(tmp_path):
+    graphs = graph_ensemble("watts_strogatz", 2, cache_dir=str(tmp_path), workers=1, n=np.int64(50), k=4,
+                            p=np.float64(0.1))
+    assert [graph.n for graph in graphs] == [50, 50]